@@ -7,6 +7,7 @@ Analyzes schemas from KuroTools and generates compatible entries for kurodlc_sch
 import json
 import os
 import struct
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 
@@ -157,30 +158,48 @@ def convert_kurotools_schema(table_name: str, schema_variants: Dict) -> List[Dic
     
     return entries
 
+def schema_layout(schema: Dict) -> Tuple:
+    """Hashable identity of a converted schema's binary layout"""
+    sch = schema["schema"]
+    return (sch["schema"], tuple(sch["keys"]), sch["values"], sch.get("primary_key"))
+
 def merge_schemas(existing_schemas: List[Dict], new_schemas: List[Dict]) -> List[Dict]:
     """
     Merge new schemas into existing ones, avoiding duplicates
-    Duplicates are detected by table_header + schema_length combination
+    Duplicates are detected by table_header + schema_length combination;
+    repeated new variants with an identical layout are added once
     """
-    # Create index of existing schemas
+    # Keys of existing schemas (only membership is needed)
     existing_index = {
-        (schema["table_header"], schema["schema_length"]): schema
+        (schema["table_header"], schema["schema_length"])
         for schema in existing_schemas
     }
     
     merged = list(existing_schemas)
     added_count = 0
+    # key -> layout of the last schema added under it. Game variants that
+    # convert to the same layout are only added once; kurodlc_lib keeps the
+    # last schema per key, so an identical repeat would change nothing
+    added_layouts = {}
+    # One line per schema; collected and written in a single call
+    lines = []
     
     for new_schema in new_schemas:
         key = (new_schema["table_header"], new_schema["schema_length"])
-        if key not in existing_index:
-            merged.append(new_schema)
-            added_count += 1
-            print(f"  + Added: {new_schema['table_header']} (size: {new_schema['schema_length']})")
-        else:
-            print(f"  = Exists: {new_schema['table_header']} (size: {new_schema['schema_length']})")
+        if key in existing_index:
+            lines.append("  = Exists: %s (size: %s)\n" % key)
+            continue
+        layout = schema_layout(new_schema)
+        if added_layouts.get(key) == layout:
+            lines.append("  = Same layout: %s (size: %s)\n" % key)
+            continue
+        added_layouts[key] = layout
+        merged.append(new_schema)
+        added_count += 1
+        lines.append("  + Added: %s (size: %s)\n" % key)
     
-    print(f"\nAdded {added_count} new schema(s)")
+    lines.append(f"\nAdded {added_count} new schema(s)\n")
+    sys.stdout.write("".join(lines))
     return merged
 
 def main():
@@ -256,11 +275,9 @@ def main():
         
         f.write("New Schema Tables:\n")
         f.write("-" * 70 + "\n")
-        existing_keys = {(s["table_header"], s["schema_length"]) for s in existing_schemas}
-        for schema in merged_schemas:
-            key = (schema["table_header"], schema["schema_length"])
-            if key not in existing_keys:
-                f.write(f"  {schema['table_header']:40s} Size: {schema['schema_length']:4d}  Game: {schema['info_comment']}\n")
+        # merge_schemas appends new schemas after the existing ones
+        for schema in merged_schemas[len(existing_schemas):]:
+            f.write(f"  {schema['table_header']:40s} Size: {schema['schema_length']:4d}  Game: {schema['info_comment']}\n")
     
     print(f"\n✓ Report saved to: {report_path}")
     print("=" * 70)
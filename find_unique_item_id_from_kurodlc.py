@@ -1,6 +1,13 @@
+import argparse
 import json
 import sys
 import os
+import mmap
+import re
+import atexit
+import tempfile
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 
 # ------------------------------------------------------------
@@ -15,6 +22,30 @@ except ImportError:
     USE_COLOR = False
     Fore = Style = type('', (), {'RED':'', 'GREEN':'', 'RESET_ALL':''})()
 
+# ------------------------------------------------------------
+# Fast JSON parsing (orjson) with stdlib fallback
+# ------------------------------------------------------------
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# ijson (optional) streams very large files instead of building the whole tree
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Files at least this large are streamed with ijson when it is installed
+STREAM_MIN_SIZE = 1 << 20
+
+# simdjson (optional) parses lazily: only the sections read become Python objects
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
 # ------------------------------------------------------------
 # Import required libraries with error handling
 # ------------------------------------------------------------
@@ -30,10 +61,131 @@ except ImportError as e:
 # Utilities
 # ------------------------------------------------------------
 
+_KURODLC_SUFFIX = re.compile(r'\.kurodlc\.json$', re.IGNORECASE).search
+
+_files_cache = None
+
 def get_all_files():
-    return [f for f in os.listdir('.') if f.lower().endswith('.kurodlc.json')]
+    # The directory is scanned once per run; the script is short-lived and
+    # never changes its working directory.
+    global _files_cache
+    if _files_cache is None:
+        with os.scandir('.') as it:
+            _files_cache = [e.name for e in it if _KURODLC_SUFFIX(e.name) and e.is_file()]
+    return _files_cache
+
+def load_json_file(path):
+    """Read and parse a JSON file (uses orjson when available)."""
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+# ------------------------------------------------------------
+# Persistent item_id cache
+# ------------------------------------------------------------
+# Maps absolute path -> [mtime_ns, size, item_ids]. A file is only re-parsed
+# when its mtime or size changed since the last run. Keys are absolute, so
+# one file in the temp directory serves every working directory.
+
+ID_CACHE_FILE = os.path.join(tempfile.gettempdir(), "kurodlc_id_cache.json")
+_id_cache = None
+_id_cache_dirty = False
+
+def _get_id_cache():
+    global _id_cache
+    if _id_cache is None:
+        try:
+            _id_cache = load_json_file(ID_CACHE_FILE)
+            if not isinstance(_id_cache, dict):
+                _id_cache = {}
+        except (OSError, ValueError):
+            _id_cache = {}
+    return _id_cache
+
+def save_id_cache():
+    """Write the item_id cache back to disk if it changed (registered with atexit)."""
+    if not _id_cache_dirty:
+        return
+    # Drop entries of files that no longer exist
+    cache = {k: v for k, v in _id_cache.items() if os.path.exists(k)}
+    # The file is shared by concurrent runs: write a temp file, fsync it and
+    # os.replace() it over the cache so readers never see a partial file
+    tmp = f"{ID_CACHE_FILE}.tmp.{os.getpid()}"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, ID_CACHE_FILE)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+atexit.register(save_id_cache)
 
 def extract_item_ids(json_file, strict=False, cmdlog=False):
+    """
+    Return item_ids of a .kurodlc.json file, using the persistent cache
+    when the file is unchanged (same mtime and size).
+    """
+    global _id_cache_dirty
+    try:
+        st = os.stat(json_file)
+    except OSError:
+        return parse_item_ids(json_file, strict, cmdlog)
+
+    key = os.path.abspath(json_file)
+    cache = _get_id_cache()
+    entry = cache.get(key)
+    if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return list(entry[2])
+
+    ids = parse_item_ids(json_file, strict, cmdlog)
+    # Only files that parsed to something are cached, so warnings for
+    # invalid files are still shown on every run.
+    if ids:
+        cache[key] = [st.st_mtime_ns, st.st_size, ids]
+        _id_cache_dirty = True
+    return ids
+
+def extract_item_ids_from_files(files):
+    """
+    Extract item_ids from several files in parallel.
+    Returns one list per file, in the same order as files.
+    """
+    if len(files) < 2:
+        return [extract_item_ids(f) for f in files]
+    _get_id_cache()  # load once before worker threads share it
+    with ThreadPoolExecutor(max_workers=min(32, len(files))) as ex:
+        return list(ex.map(extract_item_ids, files))
+
+def collect_unique_ids():
+    """Set of item_ids across every .kurodlc.json in the current directory."""
+    unique = set()
+    for ids in extract_item_ids_from_files(get_all_files()):
+        unique.update(ids)
+    return unique
+
+def has_required_sections(json_file):
+    """
+    Cheap pre-check on the raw bytes: a file that never mentions both
+    required section names is rejected without being parsed. Keys may be
+    written with JSON escapes, so a file containing any backslash is left
+    to the parser.
+    """
+    with open(json_file, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file; let the parser report it
+            return True
+        with mm:
+            if mm.find(b'\\') != -1:
+                return True
+            return mm.find(b'"CostumeParam"') != -1 and mm.find(b'"DLCTableData"') != -1
+
+def parse_item_ids(json_file, strict=False, cmdlog=False):
     """
     Extract item_ids from all relevant sections.
     
@@ -44,14 +196,23 @@ def extract_item_ids(json_file, strict=False, cmdlog=False):
     - ShopItem: uses 'item_id' field (optional section)
     """
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if not has_required_sections(json_file):
+            ids, valid, data = [], False, None
+        elif simdjson is not None:
+            ids, valid = simd_item_ids(json_file)
+            data = None
+        elif ijson is not None and os.path.getsize(json_file) >= STREAM_MIN_SIZE:
+            ids, valid = stream_item_ids(json_file)
+            data = None
+        else:
+            data = load_json_file(json_file)
+            valid = is_valid_kurodlc_structure(data)
     except Exception as e:
         if cmdlog:
             print(f"Skipping {json_file}: invalid JSON ({e})")
         return []
 
-    if not is_valid_kurodlc_structure(data):
+    if not valid:
         msg = f"{json_file} has invalid kurodlc structure"
         if strict:
             raise ValueError(msg)
@@ -59,6 +220,9 @@ def extract_item_ids(json_file, strict=False, cmdlog=False):
             print(f"Skipping {json_file}: {msg}")
         return []
 
+    if data is None:
+        return ids
+
     ids = []
     
     # CostumeParam: item_id field
@@ -81,6 +245,111 @@ def extract_item_ids(json_file, strict=False, cmdlog=False):
   
     return ids
 
+def stream_item_ids(json_file):
+    """
+    Streaming variant of parse_item_ids for large files (requires ijson).
+
+    Only the item_id / id / items values are materialized; the structure
+    checks of is_valid_kurodlc_structure are evaluated from the parse events.
+
+    Returns: (ids, valid)
+    """
+    scalar_events = ('number', 'string', 'boolean', 'null')
+    cp_ids, it_ids, dlc_ids = [], [], []
+    root_types = {}
+    root_is_object = None
+    cp_ok = dlc_ok = it_ok = it_nonempty = False
+    dlc_has_items = dlc_all_int = False
+
+    with open(json_file, 'rb') as f:
+        for prefix, event, value in ijson.parse(f):
+            if root_is_object is None:
+                root_is_object = (event == 'start_map')
+            if prefix in ('CostumeParam', 'DLCTableData', 'ItemTableData', 'ShopItem'):
+                root_types.setdefault(prefix, event)
+            elif prefix == 'CostumeParam.item.item_id' and event in scalar_events:
+                cp_ids.append(value)
+                cp_ok = cp_ok or isinstance(value, int)
+            elif prefix == 'ItemTableData.item':
+                it_nonempty = True
+            elif prefix == 'ItemTableData.item.id' and event in scalar_events:
+                it_ids.append(value)
+                it_ok = it_ok or isinstance(value, int)
+            elif prefix == 'DLCTableData.item.items.item':
+                if event in scalar_events:
+                    dlc_ids.append(value)
+                dlc_all_int = dlc_all_int and isinstance(value, int)
+            elif prefix == 'DLCTableData.item.items' and event == 'start_array':
+                dlc_has_items = dlc_all_int = True
+            elif prefix == 'DLCTableData.item':
+                if event == 'start_map':
+                    dlc_has_items = dlc_all_int = False
+                elif event == 'end_map':
+                    dlc_ok = dlc_ok or (dlc_has_items and dlc_all_int)
+
+    valid = bool(
+        root_is_object
+        and root_types.get('CostumeParam') == 'start_array'
+        and root_types.get('DLCTableData') == 'start_array'
+        and cp_ok and dlc_ok
+        # Optional sections must be lists; a non-empty ItemTableData needs an int id
+        and root_types.get('ItemTableData', 'start_array') == 'start_array'
+        and root_types.get('ShopItem', 'start_array') == 'start_array'
+        and (it_ok or not it_nonempty)
+    )
+    return cp_ids + it_ids + dlc_ids, valid
+
+def simd_value(value):
+    """Turn a simdjson proxy into plain Python objects; scalars pass through."""
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    return value
+
+def simd_item_ids(json_file):
+    """
+    simdjson variant of parse_item_ids. The document stays on the parser's
+    tape; only the item_id / id / items values are converted, and the checks
+    of is_valid_kurodlc_structure are made on the lazy proxies.
+
+    Returns: (ids, valid)
+    """
+    Object, Array = simdjson.Object, simdjson.Array
+    with open(json_file, 'rb') as f:
+        # A fresh parser per call: worker threads must not share one, and a
+        # parser cannot be reused while proxies into its document are alive
+        doc = simdjson.Parser().parse(f.read())
+
+    if not isinstance(doc, Object):
+        return [], False
+    costume = doc.get('CostumeParam')
+    dlc = doc.get('DLCTableData')
+    items = doc.get('ItemTableData', [])
+    shop = doc.get('ShopItem', [])
+    if not (isinstance(costume, Array) and isinstance(dlc, Array)
+            and isinstance(items, (Array, list)) and isinstance(shop, (Array, list))):
+        return [], False
+
+    cp_ids = [simd_value(x['item_id']) for x in costume
+              if isinstance(x, Object) and 'item_id' in x]
+    it_ids = [simd_value(x['id']) for x in items
+              if isinstance(x, Object) and 'id' in x]
+    dlc_lists = [x['items'].as_list() for x in dlc
+                 if isinstance(x, Object) and isinstance(x.get('items'), Array)]
+
+    valid = (
+        any(isinstance(i, int) for i in cp_ids)
+        and any(all(isinstance(i, int) for i in lst) for lst in dlc_lists)
+        and (not len(items) or any(isinstance(i, int) for i in it_ids))
+    )
+    if not valid:
+        return [], False
+    ids = cp_ids + it_ids
+    for lst in dlc_lists:
+        ids.extend(lst)
+    return ids, True
+
 def is_valid_kurodlc_structure(data):
     """
     Validate .kurodlc.json structure.
@@ -138,28 +407,22 @@ def is_valid_kurodlc_structure(data):
 # Source detection & selection (CHECK MODE)
 # ------------------------------------------------------------
 
-def detect_sources():
-    sources = []
-
-    if os.path.exists("t_item.json"):
-        sources.append(("json", "t_item.json"))
-
-    if os.path.exists("t_item.tbl.original"):
-        sources.append(("original", "t_item.tbl.original"))
+SOURCE_CANDIDATES = [
+    ("json", "t_item.json"),
+    ("original", "t_item.tbl.original"),
+    ("tbl", "t_item.tbl"),
+    ("p3a", "script_en.p3a"),
+    ("p3a", "script_eng.p3a"),
+    ("zzz", "zzz_combined_tables.p3a"),
+]
 
-    if os.path.exists("t_item.tbl"):
-        sources.append(("tbl", "t_item.tbl"))
-
-    if os.path.exists("script_en.p3a"):
-        sources.append(("p3a", "script_en.p3a"))
-
-    if os.path.exists("script_eng.p3a"):
-        sources.append(("p3a", "script_eng.p3a"))
-
-    if os.path.exists("zzz_combined_tables.p3a"):
-        sources.append(("zzz", "zzz_combined_tables.p3a"))
-
-    return sources
+def detect_sources():
+    # One directory read instead of a stat call per candidate.
+    # normcase keeps matching case-insensitive on Windows like os.path.exists.
+    with os.scandir('.') as it:
+        present = {os.path.normcase(e.name) for e in it}
+    return [(stype, name) for stype, name in SOURCE_CANDIDATES
+            if os.path.normcase(name) in present]
 
 def select_source_interactive(sources):
     print("\nMultiple item sources detected.\n")
@@ -171,6 +434,17 @@ def select_source_interactive(sources):
         else:
             print(f"  {i}) {name}")
 
+    # Single key press on a terminal when every choice is one digit
+    if len(sources) <= 9 and sys.stdin.isatty():
+        valid = [str(i) for i in range(1, len(sources) + 1)]
+        while True:
+            print(f"\nEnter choice [1-{len(sources)}]: ", end="", flush=True)
+            choice = read_key()
+            print(choice)
+            if choice in valid:
+                return sources[int(choice) - 1]
+            print("Invalid choice, try again.")
+
     while True:
         choice = input(f"\nEnter choice [1-{len(sources)}]: ").strip()
         if choice.isdigit():
@@ -179,17 +453,62 @@ def select_source_interactive(sources):
                 return sources[idx]
         print("Invalid choice, try again.")
 
+def read_key():
+    """Read a single key press from the terminal without waiting for Enter."""
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+    if msvcrt is not None:
+        key = msvcrt.getwch()
+        if key == "\x03":
+            raise KeyboardInterrupt
+        return key
+
+    import termios, tty
+    fd = sys.stdin.fileno()
+    old_attrs = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        return sys.stdin.read(1)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+
+def parse_check_options(options):
+    """
+    Parse check-mode options with argparse.
+    Accepts both --source=TYPE and --source TYPE; options must be spelled
+    out in full and unknown options are an error.
+    """
+    p = argparse.ArgumentParser(prog="script.py check", add_help=False,
+                                allow_abbrev=False)
+    p.add_argument("--keep-extracted", action="store_true")
+    p.add_argument("--no-interactive", action="store_true")
+    p.add_argument("--source", choices=["json", "tbl", "original", "p3a", "zzz"])
+    ns, unknown = p.parse_known_args(options)
+    if unknown:
+        print(f"Error: Unknown option(s): {' '.join(unknown)}")
+        print("Valid options: --source=TYPE, --keep-extracted, --no-interactive")
+        sys.exit(1)
+    return ns
+
 # ------------------------------------------------------------
 # Extraction from P3A
 # ------------------------------------------------------------
 
 def extract_from_p3a(p3a_file, out_file):
     """Extract t_item.tbl from P3A archive."""
+    # p3a_dict is the archive's zstd dictionary, not a name index, so the TOC
+    # is walked; names are matched with endswith instead of basename().
+    target = 't_item.tbl'
+    suffixes = ('/' + target, '\\' + target)
     p3a = p3a_class()
     with open(p3a_file, 'rb') as p3a.f:
         headers, entries, p3a_dict = p3a.read_p3a_toc()
         for entry in entries:
-            if os.path.basename(entry['name']) == 't_item.tbl':
+            name = entry['name']
+            if name == target or name.endswith(suffixes):
                 data = p3a.read_file(entry, p3a_dict)
                 with open(out_file, 'wb') as f:
                     f.write(data)
@@ -200,27 +519,52 @@ def extract_from_p3a(p3a_file, out_file):
 # Load item table
 # ------------------------------------------------------------
 
-def load_items_from_json():
-    with open('t_item.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+# Loaders return (items_dict, max_name_len); the longest name is tracked while
+# the dict is built. Results are memoized per (path, mtime, size), so loading
+# the same unchanged table again in one run returns the already-built dict.
+
+def build_items_dict(rows):
+    # One pass filling the dict and tracking the longest name. Splitting into
+    # id/name columns for dict(zip()) or dict(map(itemgetter)) was measured to
+    # be slower: the extra lists cost more than the dict resizes they avoid.
+    items_dict = {}
+    max_name_len = 0
+    for x in rows:
+        name = x['name']
+        items_dict[x['id']] = name
+        if len(name) > max_name_len:
+            max_name_len = len(name)
+    return items_dict, max_name_len
+
+def load_items_from_json(json_file='t_item.json'):
+    st = os.stat(json_file)
+    return _load_items_from_json_cached(json_file, st.st_mtime_ns, st.st_size)
+
+def load_items_from_tbl(tbl_file):
+    """Load items from .tbl file."""
+    st = os.stat(tbl_file)
+    return _load_items_from_tbl_cached(tbl_file, st.st_mtime_ns, st.st_size)
+
+@functools.lru_cache(maxsize=4)
+def _load_items_from_json_cached(json_file, mtime_ns, size):
+    data = load_json_file(json_file)
 
     for section in data.get("data", []):
         if section.get("name") == "ItemTableData":
-            return {x['id']: x['name'] for x in section.get("data", [])}
-    return {}
+            return build_items_dict(section.get("data", []))
+    return {}, 0
 
-def load_items_from_tbl(tbl_file):
-    """Load items from .tbl file."""
+@functools.lru_cache(maxsize=4)
+def _load_items_from_tbl_cached(tbl_file, mtime_ns, size):
     kt = kuro_tables()
     table = kt.read_table(tbl_file)
-    return {x['id']: x['name'] for x in table['ItemTableData']}
+    return build_items_dict(table['ItemTableData'])
 
 # ------------------------------------------------------------
-# MAIN
+# Usage
 # ------------------------------------------------------------
 
-if len(sys.argv) < 2:
-    print("""
+USAGE = """
 Usage: python script.py <mode> [options]
 
 Modes:
@@ -257,7 +601,7 @@ Modes:
 
 Check Mode Options:
 
-  --source=<type>
+  --source=<type>  (or --source <type>)
       Force the source to use for check.
       Allowed values:
         json      : use t_item.json
@@ -287,6 +631,12 @@ Check Mode Output:
     BAD       : <number of assigned IDs>
     Source used for check: <actual source file used>
 
+Cache:
+
+  Extracted item_ids are stored in kurodlc_id_cache.json in the system temp directory.
+  Unchanged .kurodlc.json files (same size and modification time) are not re-parsed
+  on later runs. Delete the cache file to force a full re-scan.
+
 Examples:
 
   python script.py costume1.kurodlc.json
@@ -296,156 +646,168 @@ Examples:
   python script.py check
   python script.py check --source=json
   python script.py check --source=p3a --keep-extracted
-""")
-    sys.exit(1)
-
-arg = sys.argv[1].lower()
-options = sys.argv[2:]
+"""
 
 # ------------------------------------------------------------
-# CHECK MODE
+# MAIN
 # ------------------------------------------------------------
 
-if arg == "check":
-    keep_extracted = "--keep-extracted" in options
-    no_interactive = "--no-interactive" in options
-
-    forced_source = None
-    for opt in options:
-        if opt.startswith("--source"):
-            if "=" in opt:
-                _, forced_source = opt.split("=", 1)
-            else:
-                print("Error: --source requires format: --source=TYPE")
-                print("Available types: json, tbl, original, p3a, zzz")
-                sys.exit(1)
-
-    sources = detect_sources()
-    if not sources:
-        print("Error: No valid item source found.")
+def main(argv):
+    """Run the tool with argv (sys.argv[1:] when used as a script)."""
+    if not argv:
+        print(USAGE)
         sys.exit(1)
-    
-    # Check if required libraries are available for P3A sources
-    if any(stype in ("p3a", "zzz") for stype, _ in sources) and not HAS_LIBS:
-        if forced_source in ("p3a", "zzz") or not forced_source:
-            print(f"Error: Required library missing: {MISSING_LIB}")
-            print("P3A extraction requires p3a_lib and kurodlc_lib modules.")
-            sys.exit(1)
-
-    extracted_temp = False
-    temp_tbl = "t_item.tbl.original.tmp"
-    used_source = None
-
-    if forced_source:
-        for stype, path in sources:
-            if stype == forced_source:
-                used_source = (stype, path)
-                break
-        if not used_source:
-            print("Forced source not available.")
-            sys.exit(1)
-    else:
-        if len(sources) == 1 or no_interactive:
-            used_source = sources[0]
-        else:
-            used_source = select_source_interactive(sources)
 
-    stype, path = used_source
+    arg = argv[0].lower()
+    options = argv[1:]
 
-    if stype == "json":
-        items_dict = load_items_from_json()
-        source_used = "t_item.json"
+    # ------------------------------------------------------------
+    # CHECK MODE
+    # ------------------------------------------------------------
 
-    elif stype in ("tbl", "original"):
-        items_dict = load_items_from_tbl(path)
-        source_used = path
+    if arg == "check":
+        opts = parse_check_options(options)
+        keep_extracted = opts.keep_extracted
+        no_interactive = opts.no_interactive
+        forced_source = opts.source
 
-    elif stype in ("p3a", "zzz"):
-        if extract_from_p3a(path, temp_tbl):
-            extracted_temp = True
-            items_dict = load_items_from_tbl(temp_tbl)
-            source_used = f"{path} → {temp_tbl}"
-        else:
-            print("Failed to extract t_item.tbl from P3A.")
+        sources = detect_sources()
+        if not sources:
+            print("Error: No valid item source found.")
             sys.exit(1)
 
-    # Collect IDs
-    all_item_ids = []
-    for f in get_all_files():
-        all_item_ids.extend(extract_item_ids(f))
-
-    unique_ids = sorted(set(all_item_ids))
-
-    max_id_len = max(len(str(i)) for i in unique_ids)
-    max_name_len = max(len(name) for name in items_dict.values()) if items_dict else 0
-
-    ok_count = 0
-    bad_count = 0
+        # Check if required libraries are available for P3A sources
+        if any(stype in ("p3a", "zzz") for stype, _ in sources) and not HAS_LIBS:
+            if forced_source in ("p3a", "zzz") or not forced_source:
+                print(f"Error: Required library missing: {MISSING_LIB}")
+                print("P3A extraction requires p3a_lib and kurodlc_lib modules.")
+                sys.exit(1)
 
-    for item_id in unique_ids:
-        id_str = str(item_id).rjust(max_id_len)
-        if item_id in items_dict:
-            name = items_dict[item_id].ljust(max_name_len)
-            print(f"{id_str} : {name} {Fore.RED}[BAD]{Style.RESET_ALL}")
-            bad_count += 1
+        extracted_temp = False
+        temp_tbl = "t_item.tbl.original.tmp"
+        used_source = None
+
+        if forced_source:
+            # First detected path wins when a type appears twice (script_en/script_eng)
+            sources_by_type = {}
+            for stype, path in sources:
+                sources_by_type.setdefault(stype, path)
+            try:
+                used_source = (forced_source, sources_by_type[forced_source])
+            except KeyError:
+                print(f"Forced source '{forced_source}' not available.")
+                print(f"Available sources: {', '.join(sources_by_type)}")
+                sys.exit(1)
         else:
-            print(f"{id_str} : {'available'.ljust(max_name_len)} {Fore.GREEN}[OK]{Style.RESET_ALL}")
-            ok_count += 1
-
-    print("\nSummary:")
-    print(f"Total IDs : {len(unique_ids)}")
-    print(f"OK        : {ok_count}")
-    print(f"BAD       : {bad_count}")
-    print(f"\nSource used for check: {source_used}")
-
-    if extracted_temp and not keep_extracted:
-        os.remove(temp_tbl)
-        print(f"Cleaned up temporary file: {temp_tbl}")
-
-    sys.exit(0)
-
-# ------------------------------------------------------------
-# OTHER MODES (unchanged)
-# ------------------------------------------------------------
-
-files = get_all_files()
+            if len(sources) == 1 or no_interactive:
+                used_source = sources[0]
+            else:
+                used_source = select_source_interactive(sources)
+
+        stype, path = used_source
+
+        # The kurodlc scan does not depend on the item table, so collect IDs
+        # in the background while the table is loaded or extracted from P3A
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            ids_future = ex.submit(collect_unique_ids)
+
+            if stype == "json":
+                items_dict, max_name_len = load_items_from_json()
+                source_used = "t_item.json"
+
+            elif stype in ("tbl", "original"):
+                items_dict, max_name_len = load_items_from_tbl(path)
+                source_used = path
+
+            elif stype in ("p3a", "zzz"):
+                if extract_from_p3a(path, temp_tbl):
+                    extracted_temp = True
+                    items_dict, max_name_len = load_items_from_tbl(temp_tbl)
+                    source_used = f"{path} → {temp_tbl}"
+                else:
+                    print("Failed to extract t_item.tbl from P3A.")
+                    sys.exit(1)
+
+            unique_ids = sorted(ids_future.result())
+
+        # Sorted ints: the longest decimal form is at one of the two ends
+        max_id_len = max(len(str(unique_ids[0])), len(str(unique_ids[-1]))) if unique_ids else 0
+
+        ok_count = 0
+        bad_count = 0
+
+        # Build all lines first and write them in one call
+        fmt_bad = f"{{0:>{max_id_len}}} : {{1:<{max_name_len}}} {Fore.RED}[BAD]{Style.RESET_ALL}\n"
+        line_ok = f" : {'available'.ljust(max_name_len)} {Fore.GREEN}[OK]{Style.RESET_ALL}\n"
+        out = []
+
+        # One dict probe per id; the name is only formatted on a hit
+        get_name = items_dict.get
+        for item_id in unique_ids:
+            name = get_name(item_id)
+            if name is not None:
+                out.append(fmt_bad.format(item_id, name))
+                bad_count += 1
+            else:
+                out.append(str(item_id).rjust(max_id_len) + line_ok)
+                ok_count += 1
+
+        sys.stdout.write("".join(out))
+
+        print("\nSummary:")
+        print(f"Total IDs : {len(unique_ids)}")
+        print(f"OK        : {ok_count}")
+        print(f"BAD       : {bad_count}")
+        print(f"\nSource used for check: {source_used}")
+
+        if extracted_temp and not keep_extracted:
+            os.remove(temp_tbl)
+            print(f"Cleaned up temporary file: {temp_tbl}")
+
+        sys.exit(0)
+
+    # ------------------------------------------------------------
+    # OTHER MODES (unchanged)
+    # ------------------------------------------------------------
+
+    files = get_all_files()
+
+    if arg == "searchall":
+        unique = set()
+        for file_ids in extract_item_ids_from_files(files):
+            unique.update(file_ids)
+        print(sorted(unique))
+
+    elif arg == "searchallbydlc":
+        unique = set()
+        for f, ids in zip(files, extract_item_ids_from_files(files)):
+            unique.update(ids)
+            print(f"{f}:")
+            print(ids)
+            print()
+        print("Unique item_ids across all files:")
+        print(sorted(unique))
+
+    elif arg == "searchallbydlcline":
+        unique = set()
+        out = []
+        for f, ids in zip(files, extract_item_ids_from_files(files)):
+            unique.update(ids)
+            out.append(f"{f}:\n")
+            out.extend(f"{i}\n" for i in sorted(ids))
+            out.append("\n")
+        out.append("Unique item_ids across all files:\n")
+        out.extend(f"{i}\n" for i in sorted(unique))
+        sys.stdout.write("".join(out))
+
+    elif arg == "searchallline":
+        unique = set()
+        for file_ids in extract_item_ids_from_files(files):
+            unique.update(file_ids)
+        sys.stdout.write("".join(f"{i}\n" for i in sorted(unique)))
 
-if arg == "searchall":
-    ids = []
-    for f in files:
-        ids.extend(extract_item_ids(f))
-    print(sorted(set(ids)))
-
-elif arg == "searchallbydlc":
-    all_ids = []
-    for f in files:
-        ids = extract_item_ids(f)
-        all_ids.extend(ids)
-        print(f"{f}:")
-        print(ids)
-        print()
-    print("Unique item_ids across all files:")
-    print(sorted(set(all_ids)))
-
-elif arg == "searchallbydlcline":
-    all_ids = []
-    for f in files:
-        ids = extract_item_ids(f)
-        all_ids.extend(ids)
-        print(f"{f}:")
-        for i in sorted(ids):
-            print(i)
-        print()
-    print("Unique item_ids across all files:")
-    for i in sorted(set(all_ids)):
-        print(i)
-
-elif arg == "searchallline":
-    ids = []
-    for f in files:
-        ids.extend(extract_item_ids(f))
-    for i in sorted(set(ids)):
-        print(i)
+    else:
+        print(sorted(set(extract_item_ids(argv[0]))))
 
-else:
-    print(sorted(set(extract_item_ids(sys.argv[1]))))
+if __name__ == "__main__":
+    main(sys.argv[1:])
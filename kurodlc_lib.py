@@ -130,7 +130,8 @@ class kuro_tables:
                 if key in self.new_entries:
                     if 'primary_key' in schema:
                         primary_key = schema['new_primary_key'] if 'new_primary_key' in schema else schema['primary_key']
-                        prior_id_values = [x[primary_key] for x in self.new_entries[key]]
+                        # Sets: one hash lookup per entry instead of a scan of every prior entry
+                        prior_id_values = {x[primary_key] for x in self.new_entries[key]}
                         duplicates = [x for x in json_data[key] if x[primary_key] in prior_id_values]
                         if len(duplicates) > 0:
                             for i in range(len(duplicates)):
@@ -146,7 +147,7 @@ class kuro_tables:
                     if 'unique_values' in schema and len(schema['unique_values']) > 0:
                         for i in range(len(schema['unique_values'])):
                             key_tag = key + '_' + schema['unique_values'][i]
-                            prior_values = [x[schema['unique_values'][i]] for x in self.new_entries[key]]
+                            prior_values = {x[schema['unique_values'][i]] for x in self.new_entries[key]}
                             duplicates = [x for x in json_data[key] if x[schema['unique_values'][i]] in prior_values]
                             if len(duplicates) > 0:
                                 for i in range(len(duplicates)):
@@ -271,7 +272,9 @@ class kuro_tables:
                             os.path.basename(table_name).replace('.original','')))
                         self.missing_schemas.append(headers[i]['name'])
                         continue
-                    raw_data = [struct.unpack(schema['schema'], f.read(schema['sch_len'])) for j in range(headers[i]['num_entries'])]
+                    # Compile the row format once and unpack the whole section from one read
+                    row_struct = struct.Struct(schema['schema'])
+                    raw_data = list(row_struct.iter_unpack(f.read(schema['sch_len'] * headers[i]['num_entries'])))
                     tbl_data[headers[i]['name']] = [decode_row(x, schema['keys'], schema['values']) for x in raw_data]
                 return(tbl_data)
         return False # Failed to read table properly
@@ -334,8 +337,8 @@ class kuro_tables:
         self.data2_buffer = b''
         for key in table:
             schema_table = self.get_schema(key, self.schema_dict[key])
-            new_table += b''.join([struct.pack(schema_table['schema'],\
-                *encode_row(x, schema_table)) for x in table[key]])
+            row_struct = struct.Struct(schema_table['schema'])
+            new_table += b''.join([row_struct.pack(*encode_row(x, schema_table)) for x in table[key]])
         assert self.data2_start_offset == len(new_table)
         new_table += self.data2_buffer
         with open(table_name, 'wb') as f:
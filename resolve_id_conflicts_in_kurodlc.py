@@ -59,6 +59,7 @@ Options:
                        Example: --mapping-file=id_mapping_DLC1.json
                        Skips interactive menu if specified.
 --keep-extracted       Keep temporary extracted t_item.tbl.original.tmp after P3A extraction.
+                       A kept copy that still matches the archive is reused next run.
 --no-interactive       Automatically selects first source if multiple found.
                        Also auto-selects newest mapping file when using --import.
 --source=<type>        Force a source: json, tbl, original, p3a, zzz.
@@ -116,7 +117,9 @@ Algorithm Details:
   - Clear error messages with suggestions
 """
 
-import os, sys, json, shutil, datetime
+import os, sys, re, json, shutil, time, datetime, tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # -------------------------
 # Import required libraries with error handling
@@ -124,6 +127,7 @@ import os, sys, json, shutil, datetime
 try:
     from p3a_lib import p3a_class
     from kurodlc_lib import kuro_tables
+    import xxhash
     HAS_LIBS = True
 except ImportError as e:
     HAS_LIBS = False
@@ -141,6 +145,15 @@ except ImportError:
         RED=GREEN=RESET_ALL=""
     Fore = Style = Dummy()
 
+# -------------------------
+# Fast JSON parsing (orjson) with stdlib fallback
+# -------------------------
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 # -------------------------
 # Smart ID Assignment Algorithm
 # -------------------------
@@ -206,25 +219,42 @@ def find_continuous_block(used_ids, count_needed, min_id, max_id):
     """
     middle = (min_id + max_id) // 2
     max_offset = max(middle - min_id, max_id - middle)
+    runs = free_run_lengths(used_ids, min_id, max_id)
     
     # Search from middle outward
     for offset in range(max_offset + 1):
         # Try middle + offset
         start = middle + offset
         if start + count_needed - 1 <= max_id:
-            if all(id not in used_ids for id in range(start, start + count_needed)):
+            if runs[start - min_id] >= count_needed:
                 return list(range(start, start + count_needed))
         
         # Try middle - offset (avoid duplicate at offset=0)
         if offset > 0:
             start = middle - offset
             if start >= min_id and start + count_needed - 1 <= max_id:
-                if all(id not in used_ids for id in range(start, start + count_needed)):
+                if runs[start - min_id] >= count_needed:
                     return list(range(start, start + count_needed))
     
     return None
 
 
+def free_run_lengths(used_ids, min_id, max_id):
+    """
+    Length of the run of unused IDs starting at each ID in [min_id, max_id].
+    
+    runs[i] is the number of consecutive free IDs from min_id + i upwards,
+    so "is the block of N IDs at start free?" becomes one lookup instead of
+    N membership tests.
+    """
+    size = max_id - min_id + 1
+    runs = [0] * (size + 1)
+    for i in range(size - 1, -1, -1):
+        if min_id + i not in used_ids:
+            runs[i] = runs[i + 1] + 1
+    return runs
+
+
 def find_scattered_ids(used_ids, count_needed, min_id, max_id):
     """
     Find scattered available IDs throughout the range.
@@ -262,65 +292,82 @@ def find_scattered_ids(used_ids, count_needed, min_id, max_id):
 def print_usage():
     print(__doc__)
 
+def load_json_file(path):
+    """Read and parse a JSON file (uses orjson when available)."""
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+def write_text_atomic(path, text):
+    """
+    Write text to path without ever leaving a half-written file behind:
+    write a temp file next to it, fsync it, then os.replace() it over path.
+    """
+    tmp = f"{path}.tmp.{os.getpid()}"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def map_files(func, files):
+    """
+    Run func over several files in parallel (file reads and parsing overlap).
+    Returns results in the same order as files.
+    """
+    if len(files) < 2:
+        return [func(f) for f in files]
+    with ThreadPoolExecutor(max_workers=min(32, len(files))) as ex:
+        return list(ex.map(func, files))
+
+# ID -> [sections] for every valid file found by get_all_files. Filled by the
+# same pass that validates the files, so each file is parsed only once.
+file_id_sections = {}
+
 def get_all_files(cmdlog=False):
-    valid_files = []
+    candidates = []
 
-    for name in os.listdir('.'):
-        lname = name.lower()
+    # scandir entries carry the file type, so is_file() needs no extra stat
+    with os.scandir('.') as it:
+        for entry in it:
+            lname = entry.name.lower()
 
-        if not lname.endswith('.kurodlc.json'):
-            continue
-        if '.bak_' in lname:
-            continue
-        if not os.path.isfile(name):
-            continue
+            if not lname.endswith('.kurodlc.json'):
+                continue
+            if '.bak_' in lname:
+                continue
+            if not entry.is_file():
+                continue
 
-        ok, reason = is_valid_kurodlc_json(name)
+            candidates.append(entry.name)
+
+    valid_files = []
+    for name, (ok, reason, id_sections) in zip(candidates, map_files(parse_and_extract, candidates)):
         if not ok:
             if cmdlog:
                 print(f"Skipping {name}: {reason}")
             continue
 
+        file_id_sections[name] = id_sections
         valid_files.append(name)
 
     return valid_files
 
 
-def extract_item_ids(json_file):
-    """
-    Extract item_ids from all relevant sections.
-    
-    Returns: list of all IDs (with duplicates if ID is in multiple sections)
-    """
-    with open(json_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    ids = []
-    
-    # CostumeParam: item_id field
-    if 'CostumeParam' in data:
-        for item in data['CostumeParam']:
-            if 'item_id' in item:
-                ids.append(item['item_id'])
-    
-    # ItemTableData: id field
-    if 'ItemTableData' in data:
-        for item in data['ItemTableData']:
-            if 'id' in item:
-                ids.append(item['id'])
-    
-    # DLCTableData: items field (list of integers)
-    if 'DLCTableData' in data:
-        for item in data['DLCTableData']:
-            if 'items' in item and isinstance(item['items'], list):
-                ids.extend(item['items'])
-    
-    # ShopItem: item_id field (optional section)
-    if 'ShopItem' in data:
-        for item in data['ShopItem']:
-            if 'item_id' in item:
-                ids.append(item['item_id'])
-    
-    return ids
+def collect_used_ids(items_dict, files):
+    """Game item IDs plus every ID found in files, merged in one update."""
+    used_ids = set(items_dict)
+    used_ids.update(*[file_id_sections[f] for f in files])
+    return used_ids
 
 
 def extract_item_ids_with_sections(json_file):
@@ -330,12 +377,18 @@ def extract_item_ids_with_sections(json_file):
     Returns: 
         - dict mapping ID -> list of sections where it appears
         - None if file cannot be read or has invalid JSON
+    Raises FileNotFoundError if json_file does not exist.
     
     Example: {3596: ['CostumeParam', 'ItemTableData', 'DLCTableData']}
     """
+    # Files found by get_all_files were already parsed while validating them
+    if json_file in file_id_sections:
+        return file_id_sections[json_file]
+    
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json_file(json_file)
+    except FileNotFoundError:
+        raise
     except json.JSONDecodeError as e:
         print(f"[ERROR] Invalid JSON in {json_file}:")
         print(f"        {e}")
@@ -348,101 +401,121 @@ def extract_item_ids_with_sections(json_file):
         print(f"[ERROR] {json_file}: Root element must be a JSON object")
         return None
     
-    id_sections = {}  # ID -> [sections]
+    id_sections = defaultdict(list)  # ID -> [sections]
     
     # CostumeParam: item_id field
     if 'CostumeParam' in data:
         for item in data['CostumeParam']:
             if 'item_id' in item:
-                item_id = item['item_id']
-                if item_id not in id_sections:
-                    id_sections[item_id] = []
-                id_sections[item_id].append('CostumeParam')
+                id_sections[item['item_id']].append('CostumeParam')
     
     # ItemTableData: id field
     if 'ItemTableData' in data:
         for item in data['ItemTableData']:
             if 'id' in item:
-                item_id = item['id']
-                if item_id not in id_sections:
-                    id_sections[item_id] = []
-                id_sections[item_id].append('ItemTableData')
+                id_sections[item['id']].append('ItemTableData')
     
-    # DLCTableData: items field (list of integers)
+    # DLCTableData: items field (list of integers), counted once per ID
     if 'DLCTableData' in data:
+        in_dlc = set()
         for dlc in data['DLCTableData']:
             if 'items' in dlc and isinstance(dlc['items'], list):
                 for item_id in dlc['items']:
-                    if item_id not in id_sections:
-                        id_sections[item_id] = []
-                    if 'DLCTableData' not in id_sections[item_id]:
+                    if item_id not in in_dlc:
+                        in_dlc.add(item_id)
                         id_sections[item_id].append('DLCTableData')
     
     # ShopItem: item_id field (optional section)
     if 'ShopItem' in data:
         for item in data['ShopItem']:
             if 'item_id' in item:
-                item_id = item['item_id']
-                if item_id not in id_sections:
-                    id_sections[item_id] = []
-                id_sections[item_id].append('ShopItem')
+                id_sections[item['item_id']].append('ShopItem')
     
-    return id_sections
+    return dict(id_sections)
 
-def is_valid_kurodlc_json(path):
+# Types isinstance(x, int) accepts for values produced by a JSON parser
+INT_TYPES = frozenset((int, bool))
+
+def parse_and_extract(path):
+    """
+    Parse a .kurodlc.json once, validating its structure and collecting
+    the sections each item ID appears in during the same walk.
+    
+    Returns: (ok, reason, id_sections); id_sections is None when not ok
+    """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            # A root object must start with '{'; reject anything else after
+            # reading only the first bytes instead of the whole file
+            head = f.read(64)
+            first = head.lstrip()[:1]
+            if first and first != b"{":
+                return False, "root is not object", None
+            data = json_loads(head + f.read())
     except Exception:
-        return False, "invalid json"
+        return False, "invalid json", None
 
     if not isinstance(data, dict):
-        return False, "root is not object"
+        return False, "root is not object", None
 
-    # ---- CostumeParam ----
     if "CostumeParam" not in data or not isinstance(data["CostumeParam"], list):
-        return False, "missing or invalid CostumeParam"
-
-    for item in data["CostumeParam"]:
-        if not isinstance(item, dict):
-            return False, "CostumeParam item not object"
-        if "item_id" not in item or not isinstance(item["item_id"], int):
-            return False, "CostumeParam.item_id missing or not int"
-
-    # ---- DLCTableData ----
+        return False, "missing or invalid CostumeParam", None
     if "DLCTableData" not in data or not isinstance(data["DLCTableData"], list):
-        return False, "missing or invalid DLCTableData"
+        return False, "missing or invalid DLCTableData", None
 
-    for item in data["DLCTableData"]:
+    id_sections = defaultdict(list)  # ID -> [sections]
+
+    # ---- CostumeParam ----
+    for item in data["CostumeParam"]:
         if not isinstance(item, dict):
-            return False, "DLCTableData item not object"
-        if "items" not in item or not isinstance(item["items"], list):
-            return False, "DLCTableData.items missing or not list"
-        if not all(isinstance(x, int) for x in item["items"]):
-            return False, "DLCTableData.items contains non-int"
+            return False, "CostumeParam item not object", None
+        item_id = item.get("item_id")
+        if not isinstance(item_id, int):
+            return False, "CostumeParam.item_id missing or not int", None
+        id_sections[item_id].append("CostumeParam")
 
     # ---- ItemTableData ---- (OPTIONAL)
     # FIXED: ItemTableData is optional in some DLC files
     if "ItemTableData" in data:
         if not isinstance(data["ItemTableData"], list):
-            return False, "invalid ItemTableData (not list)"
+            return False, "invalid ItemTableData (not list)", None
         for item in data["ItemTableData"]:
             if not isinstance(item, dict):
-                return False, "ItemTableData item not object"
-            if "id" not in item or not isinstance(item["id"], int):
-                return False, "ItemTableData.id missing or not int"
+                return False, "ItemTableData item not object", None
+            item_id = item.get("id")
+            if not isinstance(item_id, int):
+                return False, "ItemTableData.id missing or not int", None
+            id_sections[item_id].append("ItemTableData")
+
+    # ---- DLCTableData ---- (counted once per ID)
+    in_dlc = set()
+    for item in data["DLCTableData"]:
+        if not isinstance(item, dict):
+            return False, "DLCTableData item not object", None
+        items = item.get("items")
+        if not isinstance(items, list):
+            return False, "DLCTableData.items missing or not list", None
+        # Type-check the whole list at C level (JSON ints parse to int/bool)
+        if not INT_TYPES.issuperset(map(type, items)):
+            return False, "DLCTableData.items contains non-int", None
+        for item_id in items:
+            if item_id not in in_dlc:
+                in_dlc.add(item_id)
+                id_sections[item_id].append("DLCTableData")
 
     # ---- ShopItem ---- (OPTIONAL)
     if "ShopItem" in data:
         if not isinstance(data["ShopItem"], list):
-            return False, "invalid ShopItem (not list)"
+            return False, "invalid ShopItem (not list)", None
         for item in data["ShopItem"]:
             if not isinstance(item, dict):
-                return False, "ShopItem item not object"
-            if "item_id" not in item or not isinstance(item["item_id"], int):
-                return False, "ShopItem.item_id missing or not int"
+                return False, "ShopItem item not object", None
+            item_id = item.get("item_id")
+            if not isinstance(item_id, int):
+                return False, "ShopItem.item_id missing or not int", None
+            id_sections[item_id].append("ShopItem")
 
-    return True, "ok"
+    return True, "ok", dict(id_sections)
 
 # -------------------------
 # Source detection
@@ -470,9 +543,36 @@ def select_source_interactive(sources):
             return sources[int(choice)-1]
         print("Invalid choice, try again.")
 
+def pick_detected_source(no_interactive=False):
+    """Detect sources and pick one (asking only if several exist); exits if none."""
+    sources = detect_sources()
+    if not sources:
+        print("Error: No valid item source found.")
+        sys.exit(1)
+    if len(sources) == 1 or no_interactive:
+        return sources[0]
+    return select_source_interactive(sources)
+
 # -------------------------
 # P3A extraction
 # -------------------------
+def is_extracted_copy_current(entry, out_file):
+    """
+    True if out_file (kept by an earlier --keep-extracted run) already holds
+    this archive entry: same size and same xxh64 of the uncompressed data
+    as stored in the P3A TOC. Lets extraction skip the decompression.
+    """
+    if 'unc_hash' not in entry:
+        return False
+    try:
+        if os.path.getsize(out_file) != entry['unc_size']:
+            return False
+        with open(out_file, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return False
+    return xxhash.xxh64_intdigest(data) == entry['unc_hash']
+
 def extract_from_p3a(p3a_file, out_file):
     p3a=p3a_class()
     if os.path.exists(p3a_file):
@@ -480,6 +580,8 @@ def extract_from_p3a(p3a_file, out_file):
             headers, entries, p3a_dict = p3a.read_p3a_toc()
             for entry in entries:
                 if os.path.basename(entry['name'])=='t_item.tbl':
+                    if is_extracted_copy_current(entry, out_file):
+                        return True
                     data=p3a.read_file(entry,p3a_dict)
                     with open(out_file,'wb') as f: f.write(data)
                     return True
@@ -488,34 +590,76 @@ def extract_from_p3a(p3a_file, out_file):
 # -------------------------
 # Load items
 # -------------------------
+# Item tables already read are kept on disk as path -> [mtime_ns, size,
+# [[id, name], ...]], so e.g. checkbydlc followed by repair does not parse
+# the same t_item table twice. An entry is used only while the file is unchanged.
+# Keys are absolute, so one file in the temp directory serves every directory.
+ITEMS_CACHE_FILE = os.path.join(tempfile.gettempdir(), "kurodlc_items_cache.json")
+
+def load_items_cached(path, loader):
+    """Return loader()'s items_dict for path, reusing the cached copy if current."""
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    try:
+        cache = load_json_file(ITEMS_CACHE_FILE)
+        if not isinstance(cache, dict):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+
+    entry = cache.get(key)
+    if isinstance(entry, list) and len(entry) == 3 \
+            and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        try:
+            return dict(entry[2])
+        except (TypeError, ValueError):
+            pass  # damaged entry; rebuild it below
+
+    items_dict = loader()
+    # Only reached on a miss, so the file is rewritten only when it changed;
+    # entries of tables that no longer exist are dropped
+    cache = {k: v for k, v in cache.items() if os.path.exists(k)}
+    cache[key] = [st.st_mtime_ns, st.st_size, list(items_dict.items())]
+    try:
+        write_text_atomic(ITEMS_CACHE_FILE, json.dumps(cache, ensure_ascii=False))
+    except OSError:
+        pass
+    return items_dict
+
 def load_items_from_json():
-    with open('t_item.json','r',encoding='utf-8') as f:
-        data=json.load(f)
-    for section in data.get("data",[]):
-        if section.get("name")=="ItemTableData":
-            return {x['id']:x['name'] for x in section.get("data",[])}
-    return {}
+    def read():
+        data=load_json_file('t_item.json')
+        for section in data.get("data",[]):
+            if section.get("name")=="ItemTableData":
+                return {x['id']:x['name'] for x in section.get("data",[])}
+        return {}
+    return load_items_cached('t_item.json', read)
 
 def load_items_from_tbl(tbl_file):
-    kt=kuro_tables()
-    table=kt.read_table(tbl_file)
-    return {x['id']:x['name'] for x in table['ItemTableData']}
+    def read():
+        kt=kuro_tables()
+        table=kt.read_table(tbl_file)
+        return {x['id']:x['name'] for x in table['ItemTableData']}
+    return load_items_cached(tbl_file, read)
 
 # -------------------------
 # Print IDs and prepare repair
 # -------------------------
-def print_ids_for_list(item_ids, items_dict, used_ids_snapshot, mode="check"):
+def print_ids_for_list(item_ids, items_dict, used_ids_snapshot, mode="check", max_name_len=None):
     """
     Print item IDs and their conflict status.
     
     FIXED: Uses immutable snapshot of used_ids to prevent race conditions.
-    Returns repair entries without mutating the input used_ids.
+    Returns repair entries without mutating the input used_ids; the set is
+    only read (not copied), and the caller reserves the new IDs it accepts.
     
     Args:
-        item_ids: List of item IDs to check
+        item_ids: Iterable of item IDs to check (e.g. an id -> sections dict)
         items_dict: Dict of game items {id: name}
         used_ids_snapshot: Immutable set of IDs to check against
         mode: "check" or "repair"
+        max_name_len: Longest name in items_dict; pass it when calling once
+                      per file so the table is not rescanned every time
     
     Returns:
         (ok_count, bad_count, total_count, repair_entries)
@@ -525,29 +669,37 @@ def print_ids_for_list(item_ids, items_dict, used_ids_snapshot, mode="check"):
         print("No item_ids found.")
         return 0, 0, len(unique_ids), []
     
-    # Create local copy for generating new IDs
-    local_used_ids = set(used_ids_snapshot)
-    
-    max_id_len = max(len(str(i)) for i in unique_ids)
-    max_name_len = max(len(name) for name in items_dict.values()) if items_dict else 0
+    # Each ID is formatted once, for both the column width and its line
+    id_strs = list(map(str, unique_ids))
+    max_id_len = max(map(len, id_strs))
+    if max_name_len is None:
+        max_name_len = max(map(len, items_dict.values()), default=0)
     ok_count = bad_count = 0
     repair_entries = []
     
     # Collect conflicts first
     conflicts = []
     
-    for item_id in unique_ids:
-        id_str = str(item_id).rjust(max_id_len)
-        if item_id in items_dict:
-            name = items_dict[item_id].ljust(max_name_len)
-            print(f"{id_str} : {name} {Fore.RED}[BAD]{Style.RESET_ALL}")
+    # Colored tags and the OK suffix are built once; lines are written together
+    bad_tag = f" {Fore.RED}[BAD]{Style.RESET_ALL}\n"
+    ok_suffix = f" : {'available'.ljust(max_name_len)} {Fore.GREEN}[OK]{Style.RESET_ALL}\n"
+    lines = []
+    
+    get_name = items_dict.get
+    for item_id, id_str in zip(unique_ids, id_strs):
+        id_str = id_str.rjust(max_id_len)
+        name = get_name(item_id)
+        if name is not None:
+            lines.append(f"{id_str} : {name.ljust(max_name_len)}{bad_tag}")
             bad_count += 1
             if mode == "repair":
                 conflicts.append(item_id)
         else:
-            print(f"{id_str} : {'available'.ljust(max_name_len)} {Fore.GREEN}[OK]{Style.RESET_ALL}")
+            lines.append(id_str + ok_suffix)
             ok_count += 1
     
+    sys.stdout.write("".join(lines))
+    
     # NEW: Use smart algorithm to find all available IDs at once
     if mode == "repair" and conflicts:
         print(f"\n{'='*60}")
@@ -557,7 +709,7 @@ def print_ids_for_list(item_ids, items_dict, used_ids_snapshot, mode="check"):
         try:
             # Use smart algorithm with range 1-5000
             available_ids = find_available_ids_in_range(
-                local_used_ids,
+                used_ids_snapshot,
                 len(conflicts),
                 min_id=1,
                 max_id=5000
@@ -585,7 +737,6 @@ def print_ids_for_list(item_ids, items_dict, used_ids_snapshot, mode="check"):
                 conflict_name = items_dict.get(old_id, 'Unknown')
                 print(f"  {old_id} -> {new_id} ({conflict_name})")
                 repair_entries.append((old_id, new_id))
-                local_used_ids.add(new_id)
             
         except ValueError as e:
             print(f"\n[ERROR] {e}")
@@ -605,6 +756,13 @@ def print_ids_for_list(item_ids, items_dict, used_ids_snapshot, mode="check"):
 # -------------------------
 # Apply repair
 # -------------------------
+def index_section(data, section, key):
+    """Map key value -> [entries] for one section, keeping file order."""
+    index = defaultdict(list)
+    for item in data.get(section, ()):
+        index[item.get(key)].append(item)
+    return index
+
 def apply_repair(repair_entries, timestamp):
     """
     Apply repair changes to DLC files.
@@ -614,9 +772,11 @@ def apply_repair(repair_entries, timestamp):
     - Only logs when ID is actually found and changed
     - Handles all four sections properly
     """
+    # file -> {old_id: new_id}; duplicate entries collapse here and the
+    # first mapping for an old_id wins, as it did with sequential passes
     repair_per_file = {}
     for file_name, old_id, new_id in repair_entries:
-        repair_per_file.setdefault(file_name, []).append((old_id, new_id))
+        repair_per_file.setdefault(file_name, {}).setdefault(old_id, new_id)
 
     for file_name, changes in repair_per_file.items():
         if ".bak_" in file_name:
@@ -634,57 +794,64 @@ def apply_repair(repair_entries, timestamp):
         verbose_lines.append(f"Verbose log: {verbose_filename}\n")
         verbose_lines.append("-"*60)
 
-        with open(file_name, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        for old_id, new_id in changes:
+        data = load_json_file(file_name)
+
+        # DLCTableData: rewrite each items list once for all changes and
+        # remember which entries every old_id was found in for the log
+        id_map = changes
+        dlc_hits = defaultdict(list)  # old_id -> [DLC entry names]
+        if 'DLCTableData' in data:
+            for item in data['DLCTableData']:
+                if 'items' in item and isinstance(item['items'], list):
+                    found = id_map.keys() & item['items']
+                    if found:
+                        item['items'] = [id_map.get(x, x) for x in item['items']]
+                        dlc_name = item.get('name', '')
+                        for old_id in found:
+                            dlc_hits[old_id].append(dlc_name)
+
+        # Index the other sections by ID once instead of scanning them for
+        # every change
+        costume_idx = index_section(data, 'CostumeParam', 'item_id')
+        shop_idx = index_section(data, 'ShopItem', 'item_id')
+        item_idx = index_section(data, 'ItemTableData', 'id')
+
+        for old_id, new_id in changes.items():
             block_lines = []
+            change = f"{str(old_id).rjust(5)} -> {str(new_id).rjust(5)}"
             
             # CostumeParam
-            if 'CostumeParam' in data:
-                for item in data['CostumeParam']:
-                    if item.get('item_id') == old_id:
-                        mdl_name = item.get('mdl_name', '')
-                        item['item_id'] = new_id
-                        block_lines.append(f"CostumeParam : {str(old_id).rjust(5)} -> {str(new_id).rjust(5)}, mdl_name: {mdl_name}")
+            for item in costume_idx.get(old_id, ()):
+                mdl_name = item.get('mdl_name', '')
+                item['item_id'] = new_id
+                block_lines.append(f"CostumeParam : {change}, mdl_name: {mdl_name}")
             
             # ShopItem (optional section)
-            if 'ShopItem' in data:
-                for item in data['ShopItem']:
-                    if item.get('item_id') == old_id:
-                        shop_id = item.get('shop_id', '')
-                        item['item_id'] = new_id
-                        block_lines.append(f"ShopItem     : {str(old_id).rjust(5)} -> {str(new_id).rjust(5)}, shop_id : {shop_id}")
+            for item in shop_idx.get(old_id, ()):
+                shop_id = item.get('shop_id', '')
+                item['item_id'] = new_id
+                block_lines.append(f"ShopItem     : {change}, shop_id : {shop_id}")
             
             # ItemTableData
-            if 'ItemTableData' in data:
-                for item in data['ItemTableData']:
-                    if item.get('id') == old_id:
-                        name = item.get('name', '')
-                        item['id'] = new_id
-                        block_lines.append(f"ItemTableData: {str(old_id).rjust(5)} -> {str(new_id).rjust(5)}, name    : {name}")
+            for item in item_idx.get(old_id, ()):
+                name = item.get('name', '')
+                item['id'] = new_id
+                block_lines.append(f"ItemTableData: {change}, name    : {name}")
             
             # DLCTableData - FIXED: Only log if ID was actually found
-            if 'DLCTableData' in data:
-                for item in data['DLCTableData']:
-                    if 'items' in item and isinstance(item['items'], list):
-                        if old_id in item['items']:
-                            item['items'] = [new_id if x == old_id else x for x in item['items']]
-                            dlc_name = item.get('name', '')
-                            block_lines.append(f"DLCTableData : {str(old_id).rjust(5)} -> {str(new_id).rjust(5)}, name    : {dlc_name}")
+            for dlc_name in dlc_hits.get(old_id, ()):
+                block_lines.append(f"DLCTableData : {change}, name    : {dlc_name}")
 
             if block_lines:
                 verbose_lines.append("\n".join(block_lines))
                 verbose_lines.append("-"*60)
 
-        # Write updated JSON
-        with open(file_name, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        # Write updated JSON (encoded in memory, replaced atomically)
+        write_text_atomic(file_name, json.dumps(data, indent=4, ensure_ascii=False))
+        file_id_sections.pop(file_name, None)
 
         # Save verbose log
-        with open(verbose_filename, 'w', encoding='utf-8') as vf:
-            for line in verbose_lines:
-                vf.write(line + "\n")
+        write_text_atomic(verbose_filename, "\n".join(verbose_lines) + "\n")
 
         print(f"File       : {file_name}")
         print(f"Backup     : {backup_file}")
@@ -722,12 +889,18 @@ def export_id_mapping(repair_entries, items_dict, timestamp, custom_name=None, s
         # Default: use timestamp
         mapping_file = f"id_mapping_{timestamp}.json"
     
+    # Parse each affected file once; None marks a file that could not be read
+    file_sections = {}
+    for file_name, _, _ in repair_entries:
+        if file_name not in file_sections:
+            file_sections[file_name] = extract_item_ids_with_sections(file_name)
+    
     # Group by old_id and count occurrences
     id_groups = {}
     for file_name, old_id, new_id in repair_entries:
         if old_id not in id_groups:
             # Count how many times this ID appears in the file
-            id_sections = extract_item_ids_with_sections(file_name)
+            id_sections = file_sections[file_name]
             if id_sections is None:
                 print(f"[WARNING] Cannot read {file_name}, skipping occurrence count for ID {old_id}")
                 occurrences = 0  # Unknown
@@ -780,8 +953,7 @@ def export_id_mapping(repair_entries, items_dict, timestamp, custom_name=None, s
     }
     
     try:
-        with open(mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=4, ensure_ascii=False)
+        write_text_atomic(mapping_file, json.dumps(output, indent=4, ensure_ascii=False))
     except Exception as e:
         return None, [f"Error creating mapping file: {e}"]
     
@@ -892,6 +1064,19 @@ def validate_mapping_structure(data, filename):
 # -------------------------
 # Import and validate ID mapping
 # -------------------------
+# id_mapping_YYYYMMDD_HHMMSS.json, as written by --export without --export-name
+MAPPING_TS_RE = re.compile(r'^id_mapping_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})\.json$')
+
+# Characters not allowed in --export-name (reported in this order)
+INVALID_EXPORT_CHARS_ORDER = '/\\:*?"<>|'
+INVALID_EXPORT_CHARS = frozenset(INVALID_EXPORT_CHARS_ORDER)
+
+def find_mapping_files():
+    """Return names of id_mapping_*.json files in the current directory."""
+    with os.scandir('.') as it:
+        return [e.name for e in it
+                if e.name.startswith('id_mapping_') and e.name.endswith('.json') and e.is_file()]
+
 def select_mapping_file_interactive(mapping_files):
     """
     Interactive selection of mapping file when multiple files found.
@@ -909,24 +1094,11 @@ def select_mapping_file_interactive(mapping_files):
     sorted_files = sorted(mapping_files, reverse=True)
     
     for i, file in enumerate(sorted_files, 1):
-        # Try to extract timestamp from filename
-        try:
-            # Format: id_mapping_YYYYMMDD_HHMMSS.json or id_mapping_NAME.json
-            if '_20' in file:  # Has timestamp
-                parts = file.replace('id_mapping_', '').replace('.json', '').split('_')
-                if len(parts) >= 2:
-                    date_part = parts[0]
-                    time_part = parts[1] if len(parts) > 1 else ''
-                    # Format: YYYYMMDD -> YYYY-MM-DD
-                    formatted_date = f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]}"
-                    # Format: HHMMSS -> HH:MM:SS
-                    formatted_time = f"{time_part[:2]}:{time_part[2:4]}:{time_part[4:6]}" if time_part else ''
-                    display = f"{file} ({formatted_date} {formatted_time})".strip()
-                else:
-                    display = file
-            else:
-                display = file
-        except (ValueError, IndexError, AttributeError) as e:
+        # Show the timestamp for auto-named files; custom names as they are
+        m = MAPPING_TS_RE.match(file)
+        if m:
+            display = f"{file} ({m[1]}-{m[2]}-{m[3]} {m[4]}:{m[5]}:{m[6]})"
+        else:
             display = file
         
         print(f"  {i}) {display}")
@@ -939,7 +1111,7 @@ def select_mapping_file_interactive(mapping_files):
                 return sorted_files[idx]
         print("Invalid choice, try again.")
 
-def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=False):
+def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=False, mapping_data=None):
     """
     Import user-edited ID mapping and validate.
     
@@ -948,6 +1120,9 @@ def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=Fa
         used_ids: Set of already used IDs
         mapping_file: Optional path to specific mapping file
         no_interactive: If True, auto-select newest file without prompt
+        mapping_data: Optional contents of mapping_file, already parsed and
+                      checked with validate_mapping_structure; the file is
+                      then not read again
     
     Returns:
         (repair_entries, errors) tuple
@@ -956,8 +1131,7 @@ def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=Fa
     """
     # If specific file not provided, find mapping files
     if mapping_file is None:
-        mapping_files = [f for f in os.listdir('.') 
-                        if f.startswith('id_mapping_') and f.endswith('.json')]
+        mapping_files = find_mapping_files()
         
         if not mapping_files:
             return None, ["Error: No id_mapping_*.json file found in current directory"]
@@ -976,25 +1150,25 @@ def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=Fa
             if mapping_file is None:
                 return None, ["Error: No mapping file selected"]
     else:
-        # Validate that specified file exists
-        if not os.path.exists(mapping_file):
-            return None, [f"Error: Specified mapping file not found: {mapping_file}"]
         print(f"\nUsing specified mapping file: {mapping_file}")
     
     print(f"Importing ID mapping from: {mapping_file}\n")
     
-    try:
-        with open(mapping_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        return None, [f"Error: Invalid JSON in {mapping_file}: {e}"]
-    except Exception as e:
-        return None, [f"Error loading {mapping_file}: {e}"]
-    
-    # VALIDATE MAPPING FILE STRUCTURE
-    validation_errors = validate_mapping_structure(data, mapping_file)
-    if validation_errors:
-        return None, validation_errors
+    data = mapping_data
+    if data is None:
+        try:
+            data = load_json_file(mapping_file)
+        except FileNotFoundError:
+            return None, [f"Error: Specified mapping file not found: {mapping_file}"]
+        except json.JSONDecodeError as e:
+            return None, [f"Error: Invalid JSON in {mapping_file}: {e}"]
+        except Exception as e:
+            return None, [f"Error loading {mapping_file}: {e}"]
+        
+        # VALIDATE MAPPING FILE STRUCTURE
+        validation_errors = validate_mapping_structure(data, mapping_file)
+        if validation_errors:
+            return None, validation_errors
     
     mappings = data['mappings']
     
@@ -1003,6 +1177,10 @@ def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=Fa
     warnings = []
     repair_entries = []
     new_ids_used = set()
+    # file_name -> id_sections (None if unreadable, False if missing). Many
+    # mappings list the same files, so each one is checked and parsed once.
+    file_sections = {}
+    ok_lines = []
     
     print("Validating ID mappings...")
     print(f"{'='*60}\n")
@@ -1024,18 +1202,26 @@ def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=Fa
         files = mapping['files']
         
         # CRITICAL: Validate that old_id EXISTS in ALL listed files
-        # AND appears in the SAME NUMBER of sections as at export time
-        old_id_found_in_files = []
-        old_id_missing_in_files = []
-        occurrence_mismatches = []
+        # AND appears in the SAME NUMBER of sections as at export time.
+        # The detail lists are only allocated once something is wrong.
+        found_count = 0
+        old_id_missing_in_files = None
+        occurrence_mismatches = None
+        expected_occurrences = mapping.get('occurrences', None)
         
         for file_name in files:
-            if not os.path.exists(file_name):
-                errors.append(f"ID {old_id}: File does not exist: {file_name}")
-                continue
+            if file_name not in file_sections:
+                try:
+                    file_sections[file_name] = extract_item_ids_with_sections(file_name)
+                except FileNotFoundError:
+                    file_sections[file_name] = False
             
             # Get ID sections mapping
-            id_sections = extract_item_ids_with_sections(file_name)
+            id_sections = file_sections[file_name]
+            
+            if id_sections is False:
+                errors.append(f"ID {old_id}: File does not exist: {file_name}")
+                continue
             
             # Check if file loading failed
             if id_sections is None:
@@ -1051,11 +1237,10 @@ def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=Fa
                 current_sections = id_sections[old_id]
                 num_occurrences = len(current_sections)
                 
-                # Store expected occurrences from mapping (if available)
-                expected_occurrences = mapping.get('occurrences', None)
-                
                 if expected_occurrences and num_occurrences != expected_occurrences:
                     # Number of occurrences changed!
+                    if occurrence_mismatches is None:
+                        occurrence_mismatches = []
                     occurrence_mismatches.append({
                         'file': file_name,
                         'expected': expected_occurrences,
@@ -1063,37 +1248,41 @@ def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=Fa
                         'sections': current_sections
                     })
                 
-                old_id_found_in_files.append(file_name)
+                found_count += 1
             else:
                 # ID doesn't exist at all
+                if old_id_missing_in_files is None:
+                    old_id_missing_in_files = []
                 old_id_missing_in_files.append(file_name)
         
         # Check for occurrence mismatches
         if occurrence_mismatches:
-            error_msg = f"ID {old_id}: Number of occurrences changed!"
+            parts = [f"ID {old_id}: Number of occurrences changed!"]
             for mismatch in occurrence_mismatches:
-                error_msg += f"\n      File: {mismatch['file']}"
-                error_msg += f"\n      Expected: {mismatch['expected']} occurrence(s)"
-                error_msg += f"\n      Found: {mismatch['found']} occurrence(s)"
-                error_msg += f"\n      Current sections: {', '.join(mismatch['sections'])}"
-            error_msg += f"\n      Possible cause: Manual changes to file - ID removed from some sections."
-            error_msg += f"\n      Solution: Either restore ALL occurrences or create a new export."
-            errors.append(error_msg)
+                parts.append(f"      File: {mismatch['file']}")
+                parts.append(f"      Expected: {mismatch['expected']} occurrence(s)")
+                parts.append(f"      Found: {mismatch['found']} occurrence(s)")
+                parts.append(f"      Current sections: {', '.join(mismatch['sections'])}")
+            parts.append("      Possible cause: Manual changes to file - ID removed from some sections.")
+            parts.append("      Solution: Either restore ALL occurrences or create a new export.")
+            errors.append("\n".join(parts))
             continue
         
         # STRICT CHECK: old_id must exist in ALL listed files
         if old_id_missing_in_files:
             # This is ALWAYS an error - old_id must be in ALL files
-            error_msg = f"ID {old_id}: Mismatch detected! This ID is missing in some files."
-            error_msg += f"\n      Missing in: {', '.join(old_id_missing_in_files)}"
-            if old_id_found_in_files:
-                error_msg += f"\n      Found in: {', '.join(old_id_found_in_files)}"
-            error_msg += f"\n      Possible cause: Manual changes to files between export and import."
-            error_msg += f"\n      Solution: Either restore the original IDs or create a new export."
-            errors.append(error_msg)
+            parts = [f"ID {old_id}: Mismatch detected! This ID is missing in some files.",
+                     f"      Missing in: {', '.join(old_id_missing_in_files)}"]
+            if found_count:
+                old_id_found_in_files = [f for f in files
+                                         if file_sections[f] and old_id in file_sections[f]]
+                parts.append(f"      Found in: {', '.join(old_id_found_in_files)}")
+            parts.append("      Possible cause: Manual changes to files between export and import.")
+            parts.append("      Solution: Either restore the original IDs or create a new export.")
+            errors.append("\n".join(parts))
             continue
         
-        if not old_id_found_in_files:
+        if not found_count:
             # old_id not found in ANY file
             errors.append(
                 f"ID {old_id}: Not found in any listed file(s)!\n"
@@ -1119,15 +1308,15 @@ def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=Fa
             errors.append(f"ID {old_id} -> {new_id}: CONFLICT! new_id {new_id} already exists in game as '{conflict_name}'")
             continue
         
-        # Validate new_id is not already used in DLCs (except if remapping to same ID)
-        if new_id in used_ids and new_id != old_id:
-            errors.append(f"ID {old_id} -> {new_id}: CONFLICT! new_id {new_id} already used in DLC files")
-            continue
-        
-        # Validate new_id is not used twice in mapping
-        if new_id in new_ids_used and new_id != old_id:
-            errors.append(f"ID {old_id} -> {new_id}: DUPLICATE! new_id {new_id} is used multiple times in mapping")
-            continue
+        # Remapping to the same ID is always allowed; otherwise new_id must
+        # not be used in DLCs already, nor twice in this mapping
+        if new_id != old_id:
+            if new_id in used_ids:
+                errors.append(f"ID {old_id} -> {new_id}: CONFLICT! new_id {new_id} already used in DLC files")
+                continue
+            if new_id in new_ids_used:
+                errors.append(f"ID {old_id} -> {new_id}: DUPLICATE! new_id {new_id} is used multiple times in mapping")
+                continue
         
         new_ids_used.add(new_id)
         
@@ -1136,49 +1325,56 @@ def import_id_mapping(items_dict, used_ids, mapping_file=None, no_interactive=Fa
             repair_entries.append((file_name, old_id, new_id))
         
         # Green [OK] like in checkbydlc, without file count
-        print(f"\033[92m[OK]\033[0m {old_id} -> {new_id} ('{mapping.get('conflict_name', 'Unknown')}')")
+        ok_lines.append("\033[92m[OK]\033[0m %s -> %s ('%s')\n"
+                        % (old_id, new_id, mapping.get('conflict_name', 'Unknown')))
     
+    sys.stdout.write("".join(ok_lines))
     print(f"\n{'='*60}")
     
     # Show warnings
     if warnings:
-        print(f"\nWarnings ({len(warnings)}):")
-        for warning in warnings:
-            print(f"  [!] {warning}")
+        lines = [f"\nWarnings ({len(warnings)}):"]
+        lines.extend(f"  [!] {warning}" for warning in warnings)
+        sys.stdout.write("\n".join(lines) + "\n")
     
-    # Show errors with detailed summary
+    # Show errors with detailed summary, written in one go
     if errors:
-        print(f"\n{'='*60}")
-        print(f"[ERROR] VALIDATION FAILED - Found {len(errors)} issue(s)")
-        print(f"{'='*60}")
-        print("\nCannot proceed with import due to inconsistencies between")
-        print("mapping file and current state of .kurodlc.json files.")
-        print("\nDetails:")
-        print("-" * 60)
+        lines = [
+            f"\n{'='*60}",
+            f"[ERROR] VALIDATION FAILED - Found {len(errors)} issue(s)",
+            f"{'='*60}",
+            "\nCannot proceed with import due to inconsistencies between",
+            "mapping file and current state of .kurodlc.json files.",
+            "\nDetails:",
+            "-" * 60,
+        ]
         
         for i, error in enumerate(errors, 1):
-            print(f"\nIssue #{i}:")
-            # Print with proper indentation for multi-line errors
-            for line in error.split('\n'):
-                print(f"  {line}")
+            lines.append(f"\nIssue #{i}:")
+            # Indent every line of multi-line errors
+            lines.extend(f"  {line}" for line in error.split('\n'))
         
-        print("\n" + "="*60)
-        print("POSSIBLE CAUSES:")
-        print("  1. Files were manually edited between export and import")
-        print("  2. IDs were changed or removed in .kurodlc.json files")
-        print("  3. Wrong mapping file selected")
-        print("\nRECOMMENDED SOLUTIONS:")
-        print("  1. Restore original .kurodlc.json files from backup")
-        print("  2. Create a new export with current file state:")
-        print(f"     python {sys.argv[0]} repair --export")
-        print("  3. Manually fix the IDs mentioned above")
-        print("="*60 + "\n")
+        lines += [
+            "\n" + "="*60,
+            "POSSIBLE CAUSES:",
+            "  1. Files were manually edited between export and import",
+            "  2. IDs were changed or removed in .kurodlc.json files",
+            "  3. Wrong mapping file selected",
+            "\nRECOMMENDED SOLUTIONS:",
+            "  1. Restore original .kurodlc.json files from backup",
+            "  2. Create a new export with current file state:",
+            f"     python {sys.argv[0]} repair --export",
+            "  3. Manually fix the IDs mentioned above",
+            "="*60 + "\n",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
         
         return None, errors
     
     print(f"\n[SUCCESS] Validation PASSED!")
     print(f"All {len(repair_entries)} ID mappings verified successfully.")
-    print(f"Ready to modify {len(set(f for f, _, _ in repair_entries))} file(s).")
+    print(f"Ready to modify {len({entry[0] for entry in repair_entries})} file(s).")
     print(f"{'='*60}\n")
     
     return repair_entries, []
@@ -1207,6 +1403,8 @@ import_mapping = "--import" in options
 mapping_file_path = None
 export_name = None
 forced_source = None
+# One timestamp per run for backups, verbose logs and exported mappings
+timestamp = time.strftime("%Y%m%d_%H%M%S")
 
 # Validate conflicting options
 if import_mapping and export_mapping:
@@ -1220,24 +1418,27 @@ if import_mapping and apply_changes:
     apply_changes = True  # Make explicit
 
 # FIXED: Proper parsing of --source, --mapping-file, and --export-name parameters
+# Options are matched on the exact name before '=', so e.g. --source-foo
+# is not mistaken for --source
 for opt in options:
-    if opt.startswith("--source"):
-        if "=" in opt:
-            _, forced_source = opt.split("=", 1)
+    key, sep, value = opt.partition("=")
+    if key == "--source":
+        if sep:
+            forced_source = value
         else:
             print("Error: --source requires format: --source=TYPE")
             print("Available types: json, tbl, original, p3a, zzz")
             sys.exit(1)
-    elif opt.startswith("--mapping-file"):
-        if "=" in opt:
-            _, mapping_file_path = opt.split("=", 1)
+    elif key == "--mapping-file":
+        if sep:
+            mapping_file_path = value
         else:
             print("Error: --mapping-file requires format: --mapping-file=PATH")
             print("Example: --mapping-file=id_mapping_20260130_143022.json")
             sys.exit(1)
-    elif opt.startswith("--export-name"):
-        if "=" in opt:
-            _, user_input = opt.split("=", 1)
+    elif key == "--export-name":
+        if sep:
+            user_input = value
             
             # IMPROVED: Auto-add prefix and suffix if user provides just the custom part
             # User can provide:
@@ -1251,13 +1452,13 @@ for opt in options:
                 print("   Will create: id_mapping_DLC1.json")
                 sys.exit(1)
             
-            # Check for invalid characters
-            invalid_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-            for char in invalid_chars:
-                if char in user_input:
-                    print(f"Error: Export name contains invalid character '{char}': {user_input}")
-                    print(f"Invalid characters: / \\ : * ? \" < > |")
-                    sys.exit(1)
+            # Check for invalid characters (one pass over the name)
+            bad_chars = INVALID_EXPORT_CHARS.intersection(user_input)
+            if bad_chars:
+                char = next(c for c in INVALID_EXPORT_CHARS_ORDER if c in bad_chars)
+                print(f"Error: Export name contains invalid character '{char}': {user_input}")
+                print(f"Invalid characters: / \\ : * ? \" < > |")
+                sys.exit(1)
             
             # Auto-construct full filename
             if user_input.startswith('id_mapping_') and user_input.endswith('.json'):
@@ -1341,9 +1542,7 @@ if not import_mapping:
 
     # Prepare used_ids set (game + DLC)
     # FIXED: Build complete set before processing any files
-    used_ids = set(items_dict.keys())
-    for f in files:
-        used_ids.update(extract_item_ids(f))
+    used_ids = collect_used_ids(items_dict, files)
 
 # -------------------------
 # Handle --import mode separately (loads source from mapping file)
@@ -1358,8 +1557,7 @@ if arg == "repair" and import_mapping:
     
     # Find mapping file
     if mapping_file_path is None:
-        mapping_files = [f for f in os.listdir('.') 
-                        if f.startswith('id_mapping_') and f.endswith('.json')]
+        mapping_files = find_mapping_files()
         
         if not mapping_files:
             print("\nError: No id_mapping_*.json file found in current directory")
@@ -1381,8 +1579,7 @@ if arg == "repair" and import_mapping:
             print(f"\nError: Specified mapping file not found: {mapping_file_path}")
             
             # Suggest available files
-            available_files = [f for f in os.listdir('.') 
-                             if f.startswith('id_mapping_') and f.endswith('.json')]
+            available_files = find_mapping_files()
             
             if available_files:
                 print("\n" + "="*60)
@@ -1420,8 +1617,7 @@ if arg == "repair" and import_mapping:
     
     # Load mapping file to extract source info
     try:
-        with open(mapping_file_path, 'r', encoding='utf-8') as f:
-            mapping_data = json.load(f)
+        mapping_data = load_json_file(mapping_file_path)
     except json.JSONDecodeError as e:
         print(f"\nError: Invalid JSON in {mapping_file_path}: {e}")
         sys.exit(1)
@@ -1449,60 +1645,19 @@ if arg == "repair" and import_mapping:
         path = saved_source.get('path')
         
         # Validate that source still exists
-        if stype == 'json':
-            if not os.path.exists(path):
-                print(f"\nWarning: Saved source '{path}' not found!")
-                print("Falling back to source detection...")
-                # Fall back to normal source detection
-                sources = detect_sources()
-                if not sources:
-                    print("Error: No valid item source found.")
-                    sys.exit(1)
-                if len(sources) == 1 or no_interactive:
-                    stype, path = sources[0]
-                else:
-                    stype, path = select_source_interactive(sources)
-        elif stype in ('tbl', 'original'):
-            if not os.path.exists(path):
-                print(f"\nWarning: Saved source '{path}' not found!")
-                print("Falling back to source detection...")
-                sources = detect_sources()
-                if not sources:
-                    print("Error: No valid item source found.")
-                    sys.exit(1)
-                if len(sources) == 1 or no_interactive:
-                    stype, path = sources[0]
-                else:
-                    stype, path = select_source_interactive(sources)
-        elif stype in ('p3a', 'zzz'):
-            if not os.path.exists(path):
-                print(f"\nWarning: Saved source '{path}' not found!")
-                print("Falling back to source detection...")
-                sources = detect_sources()
-                if not sources:
-                    print("Error: No valid item source found.")
-                    sys.exit(1)
-                if len(sources) == 1 or no_interactive:
-                    stype, path = sources[0]
-                else:
-                    stype, path = select_source_interactive(sources)
-            
-            # Check for required libraries
-            if not HAS_LIBS:
-                print(f"Error: Required library missing: {MISSING_LIB}")
-                print("P3A extraction requires p3a_lib module.")
-                sys.exit(1)
+        if stype in ('json', 'tbl', 'original', 'p3a', 'zzz') and not os.path.exists(path):
+            print(f"\nWarning: Saved source '{path}' not found!")
+            print("Falling back to source detection...")
+            stype, path = pick_detected_source(no_interactive)
+        
+        # Check for required libraries
+        if stype in ('p3a', 'zzz') and not HAS_LIBS:
+            print(f"Error: Required library missing: {MISSING_LIB}")
+            print("P3A extraction requires p3a_lib module.")
+            sys.exit(1)
     else:
         print(f"\nStep 2: No source information in mapping file, detecting sources...")
-        sources = detect_sources()
-        if not sources:
-            print("Error: No valid item source found.")
-            sys.exit(1)
-        
-        if len(sources) == 1 or no_interactive:
-            stype, path = sources[0]
-        else:
-            stype, path = select_source_interactive(sources)
+        stype, path = pick_detected_source(no_interactive)
     
     # Load items_dict from selected source
     extracted_temp = False
@@ -1526,14 +1681,14 @@ if arg == "repair" and import_mapping:
     print(f"Source loaded: {source_used}\n")
     
     # Prepare used_ids set
-    used_ids = set(items_dict.keys())
-    for f in files:
-        all_ids = extract_item_ids(f)
-        used_ids.update(all_ids)
+    used_ids = collect_used_ids(items_dict, files)
     
     # Now validate and import mappings
     print("Step 3: Validating ID mappings...")
-    imported_entries, import_errors = import_id_mapping(items_dict, used_ids, mapping_file_path, no_interactive)
+    # The mapping file was parsed and structure-checked in Step 1
+    imported_entries, import_errors = import_id_mapping(
+        items_dict, used_ids, mapping_file_path, no_interactive, mapping_data
+    )
     
     if import_errors:
         print("\nImport validation failed:")
@@ -1548,7 +1703,6 @@ if arg == "repair" and import_mapping:
     
     # Apply the imported mapping
     print("\nStep 4: Applying imported ID mappings...\n")
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     apply_repair(imported_entries, timestamp)
     print("\n[SUCCESS] All changes from imported mapping applied successfully with backups.")
     
@@ -1563,14 +1717,16 @@ if arg == "repair" and import_mapping:
 total_ok = total_bad = total_ids = 0
 repair_log = []
 all_repair_entries = []
+max_name_len = max(map(len, items_dict.values()), default=0)
 
 for f in files:
     print(f"\nProcessing file: {f}\n")
-    all_item_ids = extract_item_ids(f)
+    # IDs were collected when get_all_files validated the file
+    all_item_ids = file_id_sections[f]
     
     # FIXED: Pass immutable snapshot, don't mutate used_ids
     ok, bad, total, repair_entries = print_ids_for_list(
-        all_item_ids, items_dict, used_ids, arg
+        all_item_ids, items_dict, used_ids, arg, max_name_len
     )
     
     print("\nSummary for this file:")
@@ -1598,15 +1754,13 @@ print(f"\nSource used for check: {source_used}")
 # Write repair log
 if arg == "repair" and repair_log:
     with open("repair_log.txt", "w", encoding="utf-8") as f:
-        for line in repair_log:
-            f.write(line + "\n")
+        f.write("\n".join(repair_log) + "\n")
     print("\n" + "-"*60)
     print("Repair log generated: repair_log.txt")
     print("-"*60 + "\n")
 
 # Export mapping if requested
 if arg == "repair" and export_mapping and all_repair_entries:
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     result = export_id_mapping(all_repair_entries, items_dict, timestamp, export_name, source_info)
     
     # Handle potential errors from export
@@ -1625,7 +1779,6 @@ if arg == "repair" and export_mapping and all_repair_entries:
 
 # Apply changes if requested (and not using import mode)
 if arg == "repair" and apply_changes and all_repair_entries and not import_mapping:
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     apply_repair(all_repair_entries, timestamp)
     print("\nAll changes applied with backups.")
 
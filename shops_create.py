@@ -14,9 +14,34 @@ NEW in v2.0:
 
 import json
 import sys
+from itertools import product
 from pathlib import Path
 from typing import Any, Dict, List
 
+# orjson parses and encodes faster when installed; fall back to stdlib json
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+
+def encode_json(data: Any) -> str:
+    """
+    Encode data as pretty-printed UTF-8 JSON.
+    
+    With orjson installed this is orjson's native output: 2-space indent,
+    shortest float repr (1e20 rather than 1e+20), NaN/Infinity as null.
+    Without orjson (or for values orjson cannot encode, e.g. integers
+    beyond 64 bits) it is json.dumps(indent=4, ensure_ascii=False).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, indent=4, ensure_ascii=False)
+
 # Default template (backward compatible with v1.0)
 DEFAULT_TEMPLATE = {
     "shop_id": "${shop_id}",
@@ -206,21 +231,23 @@ def generate_shop_items(item_ids: List[int], shop_ids: List[int],
     Returns:
         List of generated shop items
     """
+    pairs = product(item_ids, shop_ids)
+    
     if template is None:
-        template = DEFAULT_TEMPLATE
+        # DEFAULT_TEMPLATE only varies in shop_id/item_id, so skip the
+        # substitution pass; the flag lists are copied per entry
+        start_flags = DEFAULT_TEMPLATE["start_scena_flags"]
+        end_flags = DEFAULT_TEMPLATE["end_scena_flags"]
+        return [{**DEFAULT_TEMPLATE, "shop_id": shop_id, "item_id": item_id,
+                 "start_scena_flags": list(start_flags),
+                 "end_scena_flags": list(end_flags)}
+                for item_id, shop_id in pairs]
     
-    shop_items = []
     total = len(item_ids) * len(shop_ids)
-    index = 0
-    
-    for item_id in item_ids:
-        for shop_id in shop_ids:
-            # Substitute variables in template
-            item = substitute_variables(template, shop_id, item_id, index, total)
-            shop_items.append(item)
-            index += 1
     
-    return shop_items
+    # Substitute variables in template
+    return [substitute_variables(template, shop_id, item_id, index, total)
+            for index, (item_id, shop_id) in enumerate(pairs)]
 
 def main():
     """Main function."""
@@ -237,8 +264,7 @@ def main():
     
     # Load configuration
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = json_loads(config_path.read_bytes())
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON in '{config_path}': {e}")
         sys.exit(1)
@@ -307,7 +333,7 @@ def main():
     # Write output
     try:
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=4, ensure_ascii=False)
+            f.write(encode_json(result))
         
         print(f"\n{'='*60}")
         print(f"Success: File '{output_path.name}' was created successfully.")
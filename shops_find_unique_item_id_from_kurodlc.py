@@ -31,6 +31,13 @@ import os
 from datetime import datetime
 from typing import Dict, List, Set, Tuple, Any, Optional
 
+# orjson parses large .kurodlc.json files much faster; fall back to stdlib json
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 def print_usage():
     """Print usage information."""
     print("""
@@ -150,41 +157,40 @@ def is_valid_kurodlc_structure(data: Dict) -> bool:
     
     return True
 
-def extract_ids_by_mode(data: Dict, modes: Set[str]) -> Tuple[List[int], List[str]]:
+def section_ids(entries: List, key: str) -> List[int]:
+    """Collect entry[key] from every dict entry in a section that has it."""
+    return [x[key] for x in entries if isinstance(x, dict) and key in x]
+
+# (mode, section, id field) for the flat sections
+ID_SECTIONS = (
+    ("shop", "ShopItem", "item_id"),
+    ("costume", "CostumeParam", "item_id"),
+    ("item", "ItemTableData", "id"),
+)
+
+def extract_ids_by_mode(data: Dict, modes: Set[str]) -> Tuple[Set[int], List[str]]:
     """
     Extract IDs based on selected modes.
     
     Returns:
-        (list of IDs, extraction summary lines)
+        (set of unique IDs, extraction summary lines)
     """
-    all_ids = []
+    all_ids = set()
     summary = []
     
-    if "shop" in modes and "ShopItem" in data:
-        shop_ids = [item["item_id"] for item in data["ShopItem"] 
-                   if isinstance(item, dict) and "item_id" in item]
-        all_ids.extend(shop_ids)
-        summary.append(f"ShopItem: {len(shop_ids)} IDs")
-    
-    if "costume" in modes and "CostumeParam" in data:
-        costume_ids = [item["item_id"] for item in data["CostumeParam"]
-                      if isinstance(item, dict) and "item_id" in item]
-        all_ids.extend(costume_ids)
-        summary.append(f"CostumeParam: {len(costume_ids)} IDs")
-    
-    if "item" in modes and "ItemTableData" in data:
-        item_ids = [item["id"] for item in data["ItemTableData"]
-                   if isinstance(item, dict) and "id" in item]
-        all_ids.extend(item_ids)
-        summary.append(f"ItemTableData: {len(item_ids)} IDs")
+    for mode, section, key in ID_SECTIONS:
+        if mode in modes and section in data:
+            ids = section_ids(data[section], key)
+            all_ids.update(ids)
+            summary.append(f"{section}: {len(ids)} IDs")
     
     if "dlc" in modes and "DLCTableData" in data:
-        dlc_ids = []
+        count = 0
         for dlc in data["DLCTableData"]:
             if isinstance(dlc, dict) and "items" in dlc and isinstance(dlc["items"], list):
-                dlc_ids.extend(dlc["items"])
-        all_ids.extend(dlc_ids)
-        summary.append(f"DLCTableData.items: {len(dlc_ids)} IDs")
+                all_ids.update(dlc["items"])
+                count += len(dlc["items"])
+        summary.append(f"DLCTableData.items: {count} IDs")
     
     return all_ids, summary
 
@@ -201,10 +207,7 @@ def extract_shop_ids(data: Dict) -> Optional[List[int]]:
     if len(data["ShopItem"]) == 0:
         return None
     
-    shop_ids = set()
-    for item in data["ShopItem"]:
-        if isinstance(item, dict) and "shop_id" in item:
-            shop_ids.add(item["shop_id"])
+    shop_ids = set(section_ids(data["ShopItem"], "shop_id"))
     
     return sorted(list(shop_ids)) if shop_ids else None
 
@@ -257,7 +260,7 @@ def generate_template_config(json_file: str, data: Dict, modes: Set[str],
     """
     # Extract item IDs
     all_ids, extraction_summary = extract_ids_by_mode(data, modes)
-    unique_item_ids = sorted(set(all_ids))
+    unique_item_ids = sorted(all_ids)
     
     if not unique_item_ids:
         print("Error: No item IDs found in selected sections.")
@@ -451,8 +454,8 @@ def main():
     
     # Load JSON
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(json_file, 'rb') as f:
+            data = json_loads(f.read())
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON in '{json_file}': {e}")
         sys.exit(1)
@@ -495,7 +498,7 @@ def main():
     else:
         # Original behavior - extract and print IDs
         all_ids, extraction_summary = extract_ids_by_mode(data, requested_modes)
-        unique_item_ids = sorted(set(all_ids))
+        unique_item_ids = sorted(all_ids)
         
         # Print extraction summary to stderr
         if extraction_summary:
@@ -6,35 +6,45 @@ Supports loading from multiple directory structures
 import os
 import io
 import struct
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Tuple
 import base64
 
 try:
-    from PIL import Image
+    from PIL import Image, features
 except ImportError:
     Image = None
+    features = None
     print("Warning: PIL not installed. DDS conversion will be limited.")
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# DDS_HEADER fields after the magic, up to the pixel format (offset 76),
+# and DDS_PIXELFORMAT itself
+DDS_HEADER = struct.Struct('<7I44x')
+DDS_PIXELFORMAT = struct.Struct('<2I4s5I')
+
 
 class DDSHeader:
     """DDS file header parser"""
     def __init__(self, data: bytes):
-        if data[:4] != b'DDS ':
+        if not data.startswith(b'DDS '):
             raise ValueError("Not a valid DDS file")
         
-        # Read DDS_HEADER
-        header = struct.unpack('<7I44x', data[4:128])
-        self.size = header[0]
-        self.flags = header[1]
-        self.height = header[2]
-        self.width = header[3]
-        self.pitch_or_linear_size = header[4]
-        self.depth = header[5]
-        self.mipmap_count = header[6]
+        # Read DDS_HEADER and DDS_PIXELFORMAT in place, without slicing
+        # copies of the (possibly multi-MB) file data
+        (self.size, self.flags, self.height, self.width,
+         self.pitch_or_linear_size, self.depth,
+         self.mipmap_count) = DDS_HEADER.unpack_from(data, 4)
         
-        # Read DDS_PIXELFORMAT
-        pf = struct.unpack('<2I4s5I', data[76:108])
+        pf = DDS_PIXELFORMAT.unpack_from(data, 76)
         self.pf_size = pf[0]
         self.pf_flags = pf[1]
         self.pf_fourcc = pf[2]
@@ -44,52 +54,115 @@ class DDSHeader:
         return f"DDS({self.width}x{self.height}, format={self.pf_fourcc})"
 
 
-def find_texture_file(texture_name: str, search_paths: list) -> Optional[Path]:
+def build_texture_index(search_paths: list) -> Dict[str, Path]:
+    """
+    List every .dds file under the search paths once.
+    
+    Each search path is scanned directly and in its 'image' and 'textures'
+    subdirectories, in the same order find_texture_file probes them; the
+    first file found for a name wins.
+    
+    Args:
+        search_paths: List of paths to search in
+        
+    Returns:
+        Dictionary mapping lowercase file names to their paths
+    """
+    index = {}
+    for base_path in search_paths:
+        base_path = Path(base_path)
+        for directory in (base_path, base_path / 'image', base_path / 'textures'):
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        name = entry.name.lower()
+                        if name.endswith('.dds') and name not in index and entry.is_file():
+                            index[name] = directory / entry.name
+            except OSError:
+                continue  # missing or unreadable directory
+    return index
+
+
+def find_texture_file(texture_name: str, search_paths: list,
+                      index: Optional[Dict[str, Path]] = None) -> Optional[Path]:
     """
     Find texture file in multiple possible locations.
+    Without an index, found paths are cached per (texture_name, search_paths)
+    for the process; misses are not cached, so files added later are found.
     
     Args:
         texture_name: Name of texture (without or with .dds extension)
         search_paths: List of paths to search in
+        index: Optional result of build_texture_index(search_paths); when
+               given, the lookup is a dict hit (names match case-insensitively)
         
     Returns:
         Path to texture file or None if not found
     """
+    if index is not None:
+        name = texture_name.lower()
+        if not name.endswith('.dds'):
+            name = name + '.dds'
+        return index.get(name)
+    key = (texture_name, tuple(search_paths))
+    path = _found_textures.get(key)
+    if path is None:
+        path = probe_texture_file(texture_name, key[1])
+        if path is not None:
+            _found_textures[key] = path
+    return path
+
+
+# (texture_name, search_paths) -> Path; hits only
+_found_textures: Dict[tuple, Path] = {}
+
+
+def probe_texture_file(texture_name: str, search_paths: tuple) -> Optional[Path]:
+    """Uncached lookup behind find_texture_file (up to 3 stats per path)"""
     # Ensure .dds extension
     if not texture_name.lower().endswith('.dds'):
         texture_name = texture_name + '.dds'
     
-    # Try each search path
+    # Try each search path: directly, then in 'image' and 'textures'
+    # subdirectories. Plain string paths and os.path.isfile avoid building
+    # three Path objects per search path
     for base_path in search_paths:
-        base_path = Path(base_path)
-        
-        # Direct path
-        direct = base_path / texture_name
-        if direct.exists():
-            return direct
-            
-        # In 'image' subdirectory
-        in_image = base_path / 'image' / texture_name
-        if in_image.exists():
-            return in_image
-            
-        # In 'textures' subdirectory
-        in_textures = base_path / 'textures' / texture_name
-        if in_textures.exists():
-            return in_textures
+        base_path = os.fspath(base_path)
+        for candidate in (os.path.join(base_path, texture_name),
+                          os.path.join(base_path, 'image', texture_name),
+                          os.path.join(base_path, 'textures', texture_name)):
+            if os.path.isfile(candidate):
+                return Path(candidate)
     
     return None
 
 
-def convert_dds_to_png_pil(dds_data: bytes) -> Optional[bytes]:
+# Pillow save options per output format. PNG at level 1 encodes several
+# times faster than the default 6; lossless WebP at method 0 is faster still
+# and smaller, and exact=True keeps RGB under fully transparent texels
+IMAGE_SAVE_OPTIONS = {
+    'PNG': {'compress_level': 1},
+    'WEBP': {'lossless': True, 'method': 0, 'exact': True},
+}
+
+
+def data_url_format() -> str:
+    """Image format for embedded data URLs: WebP when Pillow supports it."""
+    if features is not None and features.check('webp'):
+        return 'WEBP'
+    return 'PNG'
+
+
+def convert_dds_to_png_pil(dds_data: bytes, fmt: str = 'PNG') -> Optional[bytes]:
     """
     Convert DDS to PNG using PIL (supports common formats).
     
     Args:
         dds_data: Raw DDS file bytes
+        fmt: Output format, 'PNG' or 'WEBP' (lossless)
         
     Returns:
-        PNG bytes or None if conversion failed
+        Image bytes or None if conversion failed
     """
     if Image is None:
         return None
@@ -98,9 +171,8 @@ def convert_dds_to_png_pil(dds_data: bytes) -> Optional[bytes]:
         # Try to open with PIL's DDS plugin
         img = Image.open(io.BytesIO(dds_data))
         
-        # Convert to PNG
         output = io.BytesIO()
-        img.save(output, format='PNG')
+        img.save(output, format=fmt, **IMAGE_SAVE_OPTIONS[fmt])
         return output.getvalue()
         
     except Exception as e:
@@ -108,9 +180,128 @@ def convert_dds_to_png_pil(dds_data: bytes) -> Optional[bytes]:
         return None
 
 
+# -----------------------------
+# BCn (DXT1/3/5) block decoding
+# -----------------------------
+# All blocks of the top mip level are decoded at once with NumPy: build the
+# 4-entry palette of every block, then gather each texel's palette entry.
+
+def bc1_palette(blocks, four_color_only: bool):
+    """
+    RGBA palettes (N, 4, 4) for BC1 colour blocks (first 8 bytes of blocks).
+    BC2/BC3 colour blocks always use the 4-colour mode.
+    """
+    colors = blocks[:, :4].copy().view('<u2')  # (N, 2) endpoints as RGB565
+    r = (colors >> 11).astype(np.int16)
+    g = ((colors >> 5) & 0x3F).astype(np.int16)
+    b = (colors & 0x1F).astype(np.int16)
+    rgb = np.stack([(r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)], axis=-1)
+    c0 = rgb[:, 0]
+    c1 = rgb[:, 1]
+    c2 = (2 * c0 + c1) // 3
+    c3 = (c0 + 2 * c1) // 3
+    
+    palette = np.empty((len(blocks), 4, 4), dtype=np.uint8)
+    palette[:, :, 3] = 255
+    if not four_color_only:
+        # c0 <= c1: 3 colours plus transparent black
+        three = colors[:, 0] <= colors[:, 1]
+        c2 = np.where(three[:, None], (c0 + c1) // 2, c2)
+        c3 = np.where(three[:, None], 0, c3)
+        palette[:, 3, 3] = np.where(three, 0, 255)
+    palette[:, 0, :3] = c0
+    palette[:, 1, :3] = c1
+    palette[:, 2, :3] = c2
+    palette[:, 3, :3] = c3
+    return palette
+
+
+def texel_indices(bits, bits_per_texel: int):
+    """Split packed per-block index words (N,) into (N, 16) texel indices."""
+    shifts = np.arange(16, dtype=bits.dtype) * bits.dtype.type(bits_per_texel)
+    mask = bits.dtype.type((1 << bits_per_texel) - 1)
+    return ((bits[:, None] >> shifts) & mask).astype(np.uint8)
+
+
+def gather(palette, indices):
+    """Pick palette[n, indices[n, t]] for every block n and texel t."""
+    return np.take_along_axis(palette, indices, axis=1)
+
+
+def bc1_texels(blocks, four_color_only: bool):
+    """Decode the colour half of each block into (N, 16, 4) RGBA texels."""
+    # One uint32 per RGBA palette entry, so each texel is a single gather
+    palette = bc1_palette(blocks, four_color_only).view(np.uint32)[:, :, 0]
+    bits = blocks[:, 4:8].copy().view('<u4')[:, 0]
+    texels = gather(palette, texel_indices(bits, 2))
+    return texels.view(np.uint8).reshape(len(blocks), 16, 4)
+
+
+def assemble_blocks(texels, width: int, height: int) -> bytes:
+    """Arrange (N, 16, 4) block texels into a width x height RGBA image."""
+    blocks_x = (width + 3) // 4
+    blocks_y = (height + 3) // 4
+    image = texels.reshape(blocks_y, blocks_x, 4, 4, 4)
+    image = image.transpose(0, 2, 1, 3, 4).reshape(blocks_y * 4, blocks_x * 4, 4)
+    return image[:height, :width].tobytes()
+
+
+def read_blocks(dds_data: bytes, offset: int, width: int, height: int, block_size: int):
+    """Top mip level as an (N, block_size) uint8 array of 4x4 blocks."""
+    count = ((width + 3) // 4) * ((height + 3) // 4)
+    return np.frombuffer(dds_data, dtype=np.uint8, count=count * block_size,
+                         offset=offset).reshape(count, block_size)
+
+
+def decode_bc1(dds_data: bytes, offset: int, width: int, height: int) -> bytes:
+    """DXT1/BC1: 8 bytes per block, 1-bit alpha."""
+    blocks = read_blocks(dds_data, offset, width, height, 8)
+    return assemble_blocks(bc1_texels(blocks, False), width, height)
+
+
+def decode_bc2(dds_data: bytes, offset: int, width: int, height: int) -> bytes:
+    """DXT3/BC2: 8 bytes of explicit 4-bit alpha, then a BC1 colour block."""
+    blocks = read_blocks(dds_data, offset, width, height, 16)
+    texels = bc1_texels(blocks[:, 8:], True)
+    alpha_bits = blocks[:, :8].copy().view('<u8')[:, 0]
+    texels[:, :, 3] = texel_indices(alpha_bits, 4) * 17
+    return assemble_blocks(texels, width, height)
+
+
+def decode_bc3(dds_data: bytes, offset: int, width: int, height: int) -> bytes:
+    """DXT5/BC3: interpolated 8-bit alpha block, then a BC1 colour block."""
+    blocks = read_blocks(dds_data, offset, width, height, 16)
+    texels = bc1_texels(blocks[:, 8:], True)
+    
+    a0 = blocks[:, :1].astype(np.int16)
+    a1 = blocks[:, 1:2].astype(np.int16)
+    # a0 > a1: 6 interpolated values; otherwise 4 plus 0 and 255
+    i = np.arange(1, 7, dtype=np.int16)
+    six = ((7 - i) * a0 + i * a1) // 7
+    i = np.arange(1, 5, dtype=np.int16)
+    four = ((5 - i) * a0 + i * a1) // 5
+    four = np.concatenate([four, np.zeros_like(a0), np.full_like(a0, 255)], axis=1)
+    alphas = np.concatenate([a0, a1, np.where(a0 > a1, six, four)], axis=1).astype(np.uint8)
+    
+    # 48 bits of 3-bit indices, widened to 64 for the shifts
+    packed = np.zeros((len(blocks), 8), dtype=np.uint8)
+    packed[:, :6] = blocks[:, 2:8]
+    indices = texel_indices(packed.view('<u8')[:, 0], 3)
+    texels[:, :, 3] = gather(alphas, indices)
+    return assemble_blocks(texels, width, height)
+
+
+BC_DECODERS = {
+    b'DXT1': decode_bc1,
+    b'DXT3': decode_bc2,
+    b'DXT5': decode_bc3,
+}
+
+
 def convert_dds_to_rgba_raw(dds_data: bytes) -> Optional[Tuple[int, int, bytes]]:
     """
-    Simple DDS to RGBA converter for common uncompressed formats.
+    Simple DDS to RGBA converter for common uncompressed formats and
+    DXT1/3/5 (BC1/2/3, decoded with NumPy).
     
     Args:
         dds_data: Raw DDS file bytes
@@ -127,20 +318,13 @@ def convert_dds_to_rgba_raw(dds_data: bytes) -> Optional[Tuple[int, int, bytes]]
         # Handle DXT/BC compressed formats
         fourcc = header.pf_fourcc
         
-        if fourcc == b'DXT1':
-            # DXT1/BC1 - 4x4 blocks, 8 bytes per block
-            print(f"DXT1 format detected - conversion not implemented yet")
-            return None
-            
-        elif fourcc == b'DXT3':
-            # DXT3/BC2 - 4x4 blocks, 16 bytes per block
-            print(f"DXT3 format detected - conversion not implemented yet")
-            return None
-            
-        elif fourcc == b'DXT5':
-            # DXT5/BC3 - 4x4 blocks, 16 bytes per block
-            print(f"DXT5 format detected - conversion not implemented yet")
-            return None
+        if fourcc in BC_DECODERS:
+            # DXT1/3/5 (BC1/2/3) - 4x4 blocks, decoded to RGBA8888
+            if np is None:
+                print(f"{fourcc.decode()} format detected - numpy is required to decode it")
+                return None
+            rgba = BC_DECODERS[fourcc](dds_data, data_offset, header.width, header.height)
+            return (header.width, header.height, rgba)
             
         # Uncompressed formats
         elif header.pf_rgb_bit_count == 32:
@@ -162,19 +346,51 @@ def convert_dds_to_rgba_raw(dds_data: bytes) -> Optional[Tuple[int, int, bytes]]
         return None
 
 
-def load_texture_as_data_url(texture_name: str, search_paths: list) -> Optional[str]:
+# Converted images, keyed by a hash of the DDS bytes and the output format,
+# so reopening a model skips decoding and encoding its textures
+TEXTURE_CACHE_DIR = Path(tempfile.gettempdir()) / 'kurodlc_texture_cache'
+
+
+def texture_cache_path(dds_data: bytes, fmt: str) -> Path:
+    """Cache file for the fmt conversion of dds_data"""
+    key = hashlib.blake2b(dds_data, digest_size=16).hexdigest()
+    return TEXTURE_CACHE_DIR / f"{key}.{fmt.lower()}"
+
+
+def write_texture_cache(cache_path: Path, image_data: bytes) -> None:
+    """Store a converted image; the cache is optional, so failures are ignored"""
+    tmp = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp file + replace: parallel loaders never see partial files
+        fd, tmp = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(image_data)
+        os.replace(tmp, cache_path)
+    except OSError:
+        if tmp is not None:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+def load_texture_as_data_url(texture_name: str, search_paths: list,
+                             index: Optional[Dict[str, Path]] = None) -> Optional[str]:
     """
     Load texture and convert to data URL for embedding in HTML.
     
     Args:
         texture_name: Name of texture file
         search_paths: List of paths to search
+        index: Optional texture index from build_texture_index
         
     Returns:
-        Data URL string (data:image/png;base64,...) or None
+        Data URL string (data:image/webp;base64,... or
+        data:image/png;base64,... without WebP support) or None
     """
     # Find the texture file
-    texture_path = find_texture_file(texture_name, search_paths)
+    texture_path = find_texture_file(texture_name, search_paths, index)
     if texture_path is None:
         print(f"Texture not found: {texture_name}")
         return None
@@ -185,15 +401,22 @@ def load_texture_as_data_url(texture_name: str, search_paths: list) -> Optional[
         with open(texture_path, 'rb') as f:
             dds_data = f.read()
         
-        # Try PIL conversion first (most reliable)
-        png_data = convert_dds_to_png_pil(dds_data)
+        fmt = data_url_format()
+        cache_path = texture_cache_path(dds_data, fmt)
+        try:
+            image_data = cache_path.read_bytes()
+        except OSError:
+            # Try PIL conversion first (most reliable)
+            image_data = convert_dds_to_png_pil(dds_data, fmt)
+            if image_data is not None:
+                write_texture_cache(cache_path, image_data)
         
-        if png_data is not None:
+        if image_data is not None:
             # Convert to base64 data URL
-            b64 = base64.b64encode(png_data).decode('ascii')
-            return f"data:image/png;base64,{b64}"
+            b64 = base64.b64encode(image_data).decode('ascii')
+            return f"data:image/{fmt.lower()};base64,{b64}"
         else:
-            print(f"Could not convert {texture_name} to PNG")
+            print(f"Could not convert {texture_name} to {fmt}")
             return None
             
     except Exception as e:
@@ -214,7 +437,7 @@ def load_material_textures(material_info: dict, image_list: list, search_paths:
         Dictionary mapping texture names to texture data
         {
             'texture_name': {
-                'data_url': 'data:image/png;base64,...',
+                'data_url': 'data:image/webp;base64,...',
                 'width': 1024,
                 'height': 1024
             }
@@ -233,9 +456,21 @@ def load_material_textures(material_info: dict, image_list: list, search_paths:
     
     print(f"\nLoading {len(unique_textures)} unique textures...")
     
-    # Load each texture
-    for tex_name in sorted(unique_textures):
-        data_url = load_texture_as_data_url(tex_name, search_paths)
+    # List the search directories once instead of probing them per texture
+    index = build_texture_index(search_paths)
+    
+    # Load textures in parallel: file reads, DDS decoding, image encoding
+    # and base64 all run in C code that releases the GIL
+    tex_names = sorted(unique_textures)
+    if tex_names:
+        with ThreadPoolExecutor(max_workers=min(8, len(tex_names), os.cpu_count() or 1)) as pool:
+            data_urls = list(pool.map(
+                lambda tex_name: load_texture_as_data_url(tex_name, search_paths, index),
+                tex_names))
+    else:
+        data_urls = []
+    
+    for tex_name, data_url in zip(tex_names, data_urls):
         if data_url:
             texture_cache[tex_name] = {
                 'data_url': data_url,
@@ -264,9 +499,9 @@ def create_material_texture_map(material_info: dict, texture_cache: Dict[str, di
         Dictionary mapping material names to texture info
         {
             'material_name': {
-                'diffuse': 'data:image/png;base64,...',
-                'normal': 'data:image/png;base64,...',
-                'specular': 'data:image/png;base64,...',
+                'diffuse': 'data:image/webp;base64,...',
+                'normal': 'data:image/webp;base64,...',
+                'specular': 'data:image/webp;base64,...',
             }
         }
     """
@@ -37,7 +37,7 @@ from kuro_mdl_export_meshes import decryptCLE, obtain_material_data, obtain_mesh
 
 # Import texture loader
 try:
-    from lib_texture_loader import find_texture_file, DDSHeader
+    from lib_texture_loader import find_texture_file, build_texture_index, DDSHeader
     TEXTURES_AVAILABLE = True
 except ImportError:
     print("Warning: lib_texture_loader not found. Textures will not be loaded.")
@@ -93,7 +93,8 @@ def convert_dds_to_png(dds_path: Path, output_path: Path) -> bool:
     
     try:
         img = Image.open(dds_path)
-        img.save(output_path, 'PNG')
+        # Temporary file for the viewer: favour encode speed over size
+        img.save(output_path, 'PNG', compress_level=1)
         return True
     except Exception as e:
         print(f"  [!] Failed to convert {dds_path.name}: {e}")
@@ -833,8 +834,10 @@ def load_mdl_with_textures(mdl_path: Path, temp_dir: Path, recompute_normals: bo
             print(f"  Current dir: {Path.cwd()}")
         
         print(f"\n[+] Converting textures to PNG...")
+        # List the search directories once instead of probing them per texture
+        texture_index = build_texture_index(search_paths)
         for tex_name in image_list:
-            dds_path = find_texture_file(tex_name, search_paths)
+            dds_path = find_texture_file(tex_name, search_paths, texture_index)
             
             if dds_path:
                 png_name = tex_name.replace('.dds', '.png')